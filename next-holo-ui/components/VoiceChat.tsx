@@ -43,6 +43,10 @@ export function VoiceChat({
   const mediaRecorderRef = useRef<MediaRecorder | null>(null);
   const audioContextRef = useRef<AudioContext | null>(null);
   const audioQueueRef = useRef<HTMLAudioElement[]>([]);
+  const audioFormatRef = useRef<string>("mp3");
+  const playbackContextRef = useRef<AudioContext | null>(null);
+  const playbackTimeRef = useRef(0);
+  const pcmRemainderRef = useRef<Uint8Array | null>(null);
   const streamRef = useRef<MediaStream | null>(null);
 
   // Create or get session
@@ -86,9 +90,13 @@ export function VoiceChat({
       ws.onmessage = async (event) => {
         try {
           if (event.data instanceof Blob) {
-            // Binary audio data
-            const audioBlob = new Blob([event.data], { type: "audio/mpeg" });
-            await playAudio(audioBlob);
+            // Binary audio data (format announced in the ready message)
+            if (audioFormatRef.current.startsWith("pcm_s16le_")) {
+              await playPcm(event.data);
+            } else {
+              const audioBlob = new Blob([event.data], { type: "audio/mpeg" });
+              await playAudio(audioBlob);
+            }
           } else {
             // JSON message
             const data = JSON.parse(event.data);
@@ -122,6 +130,9 @@ export function VoiceChat({
     switch (data.type) {
       case "ready":
         console.log("[VoiceChat] Pipeline ready");
+        if (data.audio_format) {
+          audioFormatRef.current = data.audio_format;
+        }
         break;
 
       case "transcript":
@@ -197,6 +208,59 @@ export function VoiceChat({
     }
   };
 
+  // Play raw 16-bit PCM chunk (no decoding, scheduled back-to-back)
+  const playPcm = async (chunk: Blob) => {
+    try {
+      const sampleRate = parseInt(audioFormatRef.current.split("_").pop() || "24000", 10);
+      let ctx = playbackContextRef.current;
+      if (!ctx) {
+        ctx = new (window.AudioContext || (window as any).webkitAudioContext)({ sampleRate });
+        playbackContextRef.current = ctx;
+        playbackTimeRef.current = 0;
+      }
+
+      // Chunks can split a sample; carry the odd byte into the next chunk
+      let bytes = new Uint8Array(await chunk.arrayBuffer());
+      const remainder = pcmRemainderRef.current;
+      if (remainder) {
+        const joined = new Uint8Array(remainder.length + bytes.length);
+        joined.set(remainder);
+        joined.set(bytes, remainder.length);
+        bytes = joined;
+        pcmRemainderRef.current = null;
+      }
+      if (bytes.length % 2 === 1) {
+        pcmRemainderRef.current = bytes.slice(bytes.length - 1);
+        bytes = bytes.slice(0, bytes.length - 1);
+      }
+      if (bytes.length === 0) return;
+
+      const samples = new Int16Array(bytes.buffer, bytes.byteOffset, bytes.length / 2);
+      const buffer = ctx.createBuffer(1, samples.length, sampleRate);
+      const channel = buffer.getChannelData(0);
+      for (let i = 0; i < samples.length; i++) {
+        channel[i] = samples[i] / 32768;
+      }
+
+      const source = ctx.createBufferSource();
+      source.buffer = buffer;
+      source.connect(ctx.destination);
+      const startAt = Math.max(playbackTimeRef.current, ctx.currentTime);
+      source.start(startAt);
+      playbackTimeRef.current = startAt + buffer.duration;
+
+      setIsSpeaking(true);
+      source.onended = () => {
+        if (ctx && ctx.currentTime >= playbackTimeRef.current) {
+          setIsSpeaking(false);
+        }
+      };
+    } catch (err) {
+      console.error("[VoiceChat] Error playing audio:", err);
+      setIsSpeaking(false);
+    }
+  };
+
   // Convert base64 to Blob
   const base64ToBlob = (base64: string, mimeType: string): Blob => {
     const byteCharacters = atob(base64);
@@ -312,6 +376,12 @@ export function VoiceChat({
       wsRef.current = null;
     }
 
+    if (playbackContextRef.current) {
+      playbackContextRef.current.close();
+      playbackContextRef.current = null;
+    }
+    pcmRemainderRef.current = null;
+
     setIsConnected(false);
     setIsListening(false);
     setIsSpeaking(false);
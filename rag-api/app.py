@@ -37,6 +37,7 @@ from .enhanced_rag_integration import EnhancedRAGPipeline
 from .live_session_storage import InMemoryLiveSessionStorage
 from .live_session_api import router as live_session_router
 from .ls1a_router import router as ls1a_router
+from .ls1a_websocket import close_ls1a_handler
 
 # ============================================================================
 # Stage B: Production Database Imports
@@ -64,6 +65,11 @@ from .indexing.indexing_router import router as indexing_router
 # Stage C: Missing Features Imports
 # ============================================================================
 from .media.media_router import router as media_router
+from .media.image_generation import close_http_session as close_image_http_session
+from .media.music_creation import close_music_creator
+from .media.social_media import close_social_media_controllers
+from .media.sound_effects import close_sound_effects_manager
+from .media.spotify_integration import close_spotify_client
 from .word_processor.word_processor_router import router as word_processor_router
 
 # ============================================================================
@@ -550,5 +556,10 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown."""
     print("🛑 Jarvis RAG API shutting down...")
-    # Add any cleanup logic here
+    await close_ls1a_handler()
+    await close_image_http_session()
+    await close_music_creator()
+    await close_social_media_controllers()
+    close_sound_effects_manager()
+    await close_spotify_client()
 
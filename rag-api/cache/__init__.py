@@ -6,10 +6,13 @@ Provides Redis-based caching for performance optimization.
 
 from .redis_cache import RedisCache, get_cache
 from .cache_middleware import CacheMiddleware
+from .response_cache import cached, invalidate_cached
 
 __all__ = [
     "RedisCache",
     "get_cache",
     "CacheMiddleware",
+    "cached",
+    "invalidate_cached",
 ]
 
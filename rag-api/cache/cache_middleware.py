@@ -33,7 +33,13 @@ class CacheMiddleware(BaseHTTPMiddleware):
             "/redoc",
             "/openapi.json",
             "/health",
-            "/metrics"
+            "/metrics",
+            # Live pass-through state and SSE streams: never buffer or replay
+            "/media/spotify",
+            "/media/music/status",
+            # Cached per endpoint by @cached, which is invalidated on writes
+            "/media/sounds",
+            "/media/social"
         ]
         self.cache = get_cache()
     
@@ -0,0 +1,109 @@
+"""
+Response Cache
+
+Per-endpoint caching of JSON handler results in Redis, with
+stale-while-error fallback when the upstream call fails.
+"""
+
+from typing import Callable, Dict, Tuple
+import asyncio
+import functools
+import hashlib
+import time
+
+from fastapi import HTTPException, Response
+
+from .redis_cache import get_cache
+
+
+# policy -> (fresh_seconds, keep_stale_seconds)
+CACHE_POLICIES: Dict[str, Tuple[int, int]] = {
+    "short": (2, 60),      # Live state (playback, devices)
+    "normal": (20, 300),   # Upstream listings (social posts)
+    "long": (60, 600),     # Local library listings (sounds)
+}
+
+KEY_PREFIX = "response:"
+
+
+def _make_key(func: Callable, kwargs: dict) -> str:
+    """Build a deterministic cache key from the handler and its arguments."""
+    args = "|".join(
+        f"{k}={kwargs[k]!r}" for k in sorted(kwargs) if not isinstance(kwargs[k], Response)
+    )
+    digest = hashlib.sha256(args.encode()).hexdigest()
+    return f"{KEY_PREFIX}{func.__module__}.{func.__name__}:{digest}"
+
+
+def cached(policy: str = "normal"):
+    """
+    Cache an async endpoint's return value in Redis.
+
+    Fresh entries are returned without calling the handler. Once an entry
+    goes stale, the handler runs again; if it fails with a server error,
+    the stale value is returned instead. Without Redis this does nothing.
+
+    If the handler declares a ``response: Response`` parameter, a matching
+    ``Cache-Control: max-age`` header is set so clients can cache too.
+
+    Args:
+        policy: Key of CACHE_POLICIES ("short", "normal", "long")
+
+    Returns:
+        Decorator for async route handlers (apply below @router.get)
+    """
+    fresh_for, keep_for = CACHE_POLICIES[policy]
+
+    def decorator(func: Callable):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            for value in kwargs.values():
+                if isinstance(value, Response):
+                    value.headers["Cache-Control"] = f"max-age={fresh_for}"
+
+            cache = get_cache()
+            if not cache:
+                return await func(*args, **kwargs)
+
+            key = _make_key(func, kwargs)
+            entry = await asyncio.to_thread(cache.get, key)
+            now = time.time()
+            if entry and now < entry["stale_at"]:
+                return entry["body"]
+
+            try:
+                body = await func(*args, **kwargs)
+            except Exception as e:
+                client_error = isinstance(e, HTTPException) and e.status_code < 500
+                if entry and not client_error:
+                    return entry["body"]
+                raise
+
+            await asyncio.to_thread(
+                cache.set,
+                key,
+                {"generated_at": now, "stale_at": now + fresh_for, "body": body},
+                keep_for
+            )
+            return body
+
+        return wrapper
+
+    return decorator
+
+
+async def invalidate_cached(*funcs: Callable):
+    """
+    Drop cached responses for the given handlers.
+
+    Args:
+        funcs: Handlers decorated with @cached (or the originals)
+    """
+    cache = get_cache()
+    if not cache:
+        return
+    for func in funcs:
+        func = getattr(func, "__wrapped__", func)
+        await asyncio.to_thread(
+            cache.clear_pattern, f"{KEY_PREFIX}{func.__module__}.{func.__name__}:*"
+        )
@@ -12,8 +12,10 @@ Real-time audio processing pipeline with:
 import asyncio
 import json
 import os
+import re
+import time
 import base64
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, Tuple
 from datetime import datetime
 import websockets
 from deepgram import DeepgramClient, PrerecordedOptions, LiveOptions, LiveTranscriptionEvents
@@ -23,6 +25,150 @@ from .models import LiveSession
 from .live_session_storage import LiveSessionStorage
 from .cost import CostTracker
 
+# TTS output: raw 16-bit mono PCM so clients play it without decoding
+TTS_OUTPUT_FORMAT = "pcm_24000"  # ElevenLabs output_format
+TTS_AUDIO_FORMAT = "pcm_s16le_24000"  # Announced to clients
+TTS_SAMPLE_RATE = 24000
+TTS_BYTES_PER_SECOND = TTS_SAMPLE_RATE * 1 * 2  # mono, 16-bit
+TTS_BYTES_PER_MINUTE = TTS_BYTES_PER_SECOND * 60
+
+# Audio usage is flushed to storage/cost tracker at most this often
+AUDIO_FLUSH_BYTES = TTS_BYTES_PER_SECOND  # 1 second of audio
+AUDIO_FLUSH_INTERVAL = 0.25  # seconds (wall-clock)
+
+# Budget status changes slowly; reuse a lookup for this long
+BUDGET_STATUS_TTL = 0.5  # seconds
+
+# Inbound mic audio buffered ahead of Deepgram; a full queue back-pressures
+# the WebSocket receive loop instead of growing memory
+DEEPGRAM_SEND_QUEUE_SIZE = 64
+DEEPGRAM_SEND_COALESCE = 4  # Max queued chunks merged into one send
+
+# Warm pool of pre-opened Deepgram connections (0 disables)
+DEEPGRAM_POOL_SIZE = int(os.getenv("LS1A_DEEPGRAM_POOL_SIZE", "2"))
+DEEPGRAM_POOL_MAX_AGE = 60.0  # seconds an unused connection may sit in the pool
+DEEPGRAM_KEEPALIVE_INTERVAL = 5.0  # Deepgram drops sockets idle for ~10s
+
+# Voice replies are short; also capped by the user's remaining token budget
+LLM_MAX_TOKENS = 200
+
+# Seconds between full-transcript checkpoints while live; close() writes
+# the final transcript. Finals since the last checkpoint are lost if the
+# process dies, and a resumed session starts from the checkpoint.
+TRANSCRIPT_CHECKPOINT_INTERVAL = 10.0
+
+# Sentence chunking for streaming LLM output into TTS
+_SENTENCE_END = re.compile(r"[.!?](?=\s)")
+TTS_MAX_CLAUSE_CHARS = 120
+
+
+def _split_sentence(buffer: str) -> Tuple[str, str]:
+    """
+    Split completed sentences off the front of a streaming text buffer.
+    
+    Args:
+        buffer: Text received so far that has not been spoken yet
+    
+    Returns:
+        Tuple of (text ready for TTS, remaining buffer). Ready text is empty
+        until a sentence ends or the buffer reaches TTS_MAX_CLAUSE_CHARS.
+    """
+    end = -1
+    for match in _SENTENCE_END.finditer(buffer):
+        end = match.end()
+    
+    if end < 0 and len(buffer) >= TTS_MAX_CLAUSE_CHARS:
+        # No sentence boundary yet - cut long clauses at the last word break
+        end = buffer.rfind(" ")
+        if end <= 0:
+            end = len(buffer)
+    
+    if end < 0:
+        return "", buffer
+    return buffer[:end].strip(), buffer[end:]
+
+
+def _deepgram_live_options() -> LiveOptions:
+    """Live transcription options shared by pooled and on-demand connections."""
+    return LiveOptions(
+        model="nova-2",  # or "nova-3" for better accuracy
+        language="en-US",
+        smart_format=True,
+        interim_results=True,  # Get partial transcripts
+        utterance_end_ms=1000,  # 1 second silence = end of utterance
+        vad_events=True,  # Voice activity detection for barge-in
+        sample_rate=16000,  # 16kHz audio
+        channels=1,
+        encoding="linear16"
+    )
+
+
+class _DeepgramRoute:
+    """
+    Forwards Deepgram events to whichever pipeline owns the connection.
+    
+    The SDK has no way to unregister handlers, so connections opened ahead
+    of time register this route and get a pipeline bound on hand-out.
+    The async client calls each handler as a coroutine with the client as
+    the first argument, on the event loop.
+    """
+    
+    def __init__(self, pipeline: Optional["LS1APipeline"] = None):
+        self.pipeline = pipeline
+        self.closed = False  # Set once Deepgram closes the socket
+    
+    async def on_open(self, _client, *args, **kwargs):
+        if self.pipeline:
+            self.pipeline._on_deepgram_open(*args, **kwargs)
+    
+    async def on_transcript(self, _client, *args, **kwargs):
+        if self.pipeline:
+            self.pipeline._on_deepgram_transcript(*args, **kwargs)
+    
+    async def on_utterance_end(self, _client, *args, **kwargs):
+        if self.pipeline:
+            self.pipeline._on_deepgram_utterance_end(*args, **kwargs)
+    
+    async def on_speech_started(self, _client, *args, **kwargs):
+        if self.pipeline:
+            self.pipeline._on_deepgram_speech_started(*args, **kwargs)
+    
+    async def on_error(self, _client, *args, **kwargs):
+        if self.pipeline:
+            self.pipeline._on_deepgram_error(*args, **kwargs)
+    
+    async def on_close(self, _client, *args, **kwargs):
+        self.closed = True
+
+
+async def _open_deepgram_connection(deepgram: DeepgramClient, route: _DeepgramRoute):
+    """
+    Open a Deepgram live connection with events sent through a route.
+    
+    Args:
+        deepgram: Deepgram client
+        route: Route that receives the connection's events
+    
+    Returns:
+        Started Deepgram connection object
+    """
+    # Async client, so start/send/keep_alive/finish are all awaited and
+    # events arrive on the event loop
+    connection = deepgram.listen.asynclive.v("1")
+    
+    # Register event handlers
+    connection.on(LiveTranscriptionEvents.Open, route.on_open)
+    connection.on(LiveTranscriptionEvents.Transcript, route.on_transcript)
+    connection.on(LiveTranscriptionEvents.UtteranceEnd, route.on_utterance_end)
+    connection.on(LiveTranscriptionEvents.SpeechStarted, route.on_speech_started)
+    connection.on(LiveTranscriptionEvents.Error, route.on_error)
+    connection.on(LiveTranscriptionEvents.Close, route.on_close)
+    
+    # Start connection
+    if not await connection.start(_deepgram_live_options()):
+        raise ConnectionError("Failed to connect to Deepgram")
+    return connection
+
 
 class LS1APipeline:
     """
@@ -74,18 +220,34 @@ class LS1APipeline:
         self.deepgram = DeepgramClient(self.deepgram_api_key)
         self.openai = AsyncOpenAI(api_key=self.openai_api_key)
         self.elevenlabs = AsyncElevenLabs(api_key=self.elevenlabs_api_key)
+        self.deepgram_connection = None  # Set by connect_deepgram()
+        self._deepgram_route: Optional[_DeepgramRoute] = None
         
         # Pipeline state
         self.is_speaking = False  # TTS playback state
         self.is_listening = False  # User speaking state
         self.transcript_buffer = ""  # Current transcript
+        # Finalized utterances, joined once on close (resumed sessions keep earlier text)
+        self._transcript_parts: list = [session.transcript_partial] if session.transcript_partial else []
+        self._transcript_checkpoint_ts = 0.0  # Last full-transcript write
         self.llm_response_buffer = ""  # Streaming LLM response
-        self.tts_queue = asyncio.Queue()  # TTS audio chunks queue
+        self.tts_queue = asyncio.Queue()  # Sentences waiting for TTS
         self.barge_in_detected = False  # Barge-in flag
+        self._llm_task: Optional[asyncio.Task] = None  # In-flight LLM response
+        self._tts_task: Optional[asyncio.Task] = None  # In-flight TTS stream
+        self._dg_send_q: asyncio.Queue = asyncio.Queue(maxsize=DEEPGRAM_SEND_QUEUE_SIZE)
+        self._dg_sender: Optional[asyncio.Task] = None  # Drains _dg_send_q
         
         # Audio tracking
         self.audio_start_time: Optional[datetime] = None
-        self.total_audio_seconds = 0.0
+        self.total_audio_bytes = 0  # Integer byte count, converted to time on read
+        self._flushed_audio_bytes = 0  # Portion already recorded in storage
+        self._last_flush_ts = time.monotonic()
+        self._budget_cache: Tuple[float, Dict[str, Any]] = (0.0, {})  # (fetched_at, status)
+        
+        # Session storage writes run off the event loop, merged while one is in flight
+        self._pending_storage_patch: Dict[str, Any] = {}
+        self._storage_task: Optional[asyncio.Task] = None
         
         # Callbacks
         self.on_transcript: Optional[Callable[[str, bool], None]] = None  # (text, is_final)
@@ -93,41 +255,29 @@ class LS1APipeline:
         self.on_budget_warning: Optional[Callable[[float], None]] = None  # (utilization)
         self.on_error: Optional[Callable[[Exception], None]] = None  # (error)
     
-    async def connect_deepgram(self):
+    async def connect_deepgram(self, pool: Optional["DeepgramConnectionPool"] = None):
         """
         Connect to Deepgram WebSocket for real-time transcription.
         
+        Args:
+            pool: Optional warm pool to take an already-open connection from;
+                a new connection is opened if the pool is empty
+        
         Returns:
             Deepgram connection object
         """
-        # Connection options
-        options = LiveOptions(
-            model="nova-2",  # or "nova-3" for better accuracy
-            language="en-US",
-            smart_format=True,
-            interim_results=True,  # Get partial transcripts
-            utterance_end_ms=1000,  # 1 second silence = end of utterance
-            vad_events=True,  # Voice activity detection for barge-in
-            sample_rate=16000,  # 16kHz audio
-            channels=1,
-            encoding="linear16"
-        )
-        
-        # Create connection using Deepgram SDK
-        connection = self.deepgram.listen.live.v("1")
-        
-        # Register event handlers
-        connection.on(LiveTranscriptionEvents.Open, self._on_deepgram_open)
-        connection.on(LiveTranscriptionEvents.Transcript, self._on_deepgram_transcript)
-        connection.on(LiveTranscriptionEvents.UtteranceEnd, self._on_deepgram_utterance_end)
-        connection.on(LiveTranscriptionEvents.SpeechStarted, self._on_deepgram_speech_started)
-        connection.on(LiveTranscriptionEvents.Error, self._on_deepgram_error)
-        
-        # Start connection
-        if not await connection.start(options):
-            raise ConnectionError("Failed to connect to Deepgram")
+        pooled = pool.acquire() if pool else None
+        if pooled:
+            connection, route = pooled
+            route.pipeline = self
+            print(f"[LS1A] Using pre-warmed Deepgram connection for session {self.session.id}")
+        else:
+            route = _DeepgramRoute(self)
+            connection = await _open_deepgram_connection(self.deepgram, route)
         
+        self._deepgram_route = route
         self.deepgram_connection = connection
+        self._dg_sender = asyncio.create_task(self._dg_sender_loop())
         return connection
     
     def _on_deepgram_open(self, *args, **kwargs):
@@ -146,67 +296,99 @@ class LS1APipeline:
                 
                 if text:
                     if is_final:
-                        # Final transcript - append to buffer
-                        self.transcript_buffer = text
+                        # Final transcript - recorded here, so UtteranceEnd
+                        # has nothing left to finalize
+                        self.transcript_buffer = ""
                     else:
                         # Partial transcript - update current
                         self.transcript_buffer = text
                     
-                    # Update session transcript
-                    self._update_session_transcript(text, is_final)
+                    # Persist finals only; partials are superseded within
+                    # a few hundred ms and only matter to the live client
+                    if is_final:
+                        self._update_session_transcript(text, is_final)
                     
                     # Callback
-                    if self.on_transcript:
-                        asyncio.create_task(self._call_callback(
-                            self.on_transcript, text, is_final
-                        ))
+                    self._dispatch(self.on_transcript, text, is_final)
                     
                     # If final, trigger LLM
                     if is_final and text:
-                        asyncio.create_task(self._process_llm(text))
+                        self._start_response(text)
         except Exception as e:
             print(f"[LS1A] Transcript error: {e}")
-            if self.on_error:
-                asyncio.create_task(self._call_callback(self.on_error, e))
+            self._dispatch(self.on_error, e)
     
-    def _on_deepgram_utterance_end(self, result, **kwargs):
+    def _on_deepgram_utterance_end(self, *args, **kwargs):
         """Handle Deepgram utterance end (user finished speaking)."""
         if self.transcript_buffer:
-            # Finalize transcript
+            # Finalize a partial that never got a final result
             self._update_session_transcript(self.transcript_buffer, is_final=True)
             # Process with LLM
-            asyncio.create_task(self._process_llm(self.transcript_buffer))
+            self._start_response(self.transcript_buffer)
             self.transcript_buffer = ""
     
-    def _on_deepgram_speech_started(self, result, **kwargs):
+    def _on_deepgram_speech_started(self, *args, **kwargs):
         """Handle Deepgram speech started (barge-in detection)."""
         self.is_listening = True
         self.barge_in_detected = True
         
+        # Cancel the in-flight response immediately instead of waiting for
+        # the next stream chunk to notice the flag
+        self._cancel_response()
+        
         # Cancel TTS if speaking
         if self.is_speaking:
             print("[LS1A] Barge-in detected, canceling TTS")
             self.is_speaking = False
-            # Clear TTS queue
-            while not self.tts_queue.empty():
-                try:
-                    self.tts_queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    break
+        
+        # Drop pending sentences in O(1). The queue's only consumer is the
+        # TTS task cancelled above, so swapping in a fresh queue is safe.
+        self.tts_queue = asyncio.Queue()
+    
+    def _start_response(self, transcript: str):
+        """
+        Start the reply to a user turn, replacing any reply still running.
+        
+        Args:
+            transcript: User transcript text
+        """
+        # Only one turn may stream at a time; an orphaned one would keep
+        # speaking over the new one and be out of reach of barge-in
+        self._cancel_response()
+        self._llm_task = asyncio.create_task(self._process_llm(transcript))
+    
+    def _cancel_response(self):
+        """Cancel in-flight LLM and TTS tasks (barge-in)."""
+        for task in (self._llm_task, self._tts_task):
+            if task and not task.done():
+                task.cancel()
     
     def _on_deepgram_error(self, error, **kwargs):
         """Handle Deepgram error."""
         print(f"[LS1A] Deepgram error: {error}")
-        if self.on_error:
-            asyncio.create_task(self._call_callback(self.on_error, Exception(str(error))))
+        self._dispatch(self.on_error, Exception(str(error)))
+    
+    def _dispatch(self, callback: Optional[Callable], *args):
+        """
+        Invoke a callback safely.
+        
+        Plain functions run inline; only coroutine functions get a task, so
+        frequent events like partial transcripts don't allocate one each.
+        """
+        if callback is None:
+            return
+        if asyncio.iscoroutinefunction(callback):
+            asyncio.create_task(self._call_callback(callback, *args))
+            return
+        try:
+            callback(*args)
+        except Exception as e:
+            print(f"[LS1A] Callback error: {e}")
     
     async def _call_callback(self, callback: Callable, *args):
-        """Helper to call callback safely."""
+        """Helper to await a coroutine callback safely."""
         try:
-            if asyncio.iscoroutinefunction(callback):
-                await callback(*args)
-            else:
-                callback(*args)
+            await callback(*args)
         except Exception as e:
             print(f"[LS1A] Callback error: {e}")
     
@@ -217,13 +399,22 @@ class LS1APipeline:
         Args:
             transcript: User transcript text
         """
+        # A new user turn supersedes any earlier barge-in
+        self.barge_in_detected = False
+        stream = None
+        tts_queue = None
         try:
             # Check budget before LLM call
-            budget_status = self.cost_tracker.get_budget_status(self.session.user_id)
-            if budget_status.get("text_tokens", {}).get("utilization", 0) >= 1.0:
+            budget_status = self._cached_budget_status()
+            text_budget = budget_status.get("text_tokens", {})
+            if text_budget.get("utilization", 0) >= 1.0:
                 # Budget exhausted
                 await self._handle_budget_exhausted()
                 return
+            max_tokens = LLM_MAX_TOKENS
+            remaining = text_budget.get("remaining")
+            if remaining is not None:
+                max_tokens = max(1, min(max_tokens, int(remaining)))
             
             # Prepare messages
             messages = [
@@ -237,25 +428,80 @@ class LS1APipeline:
                 model="gpt-4o",  # or "gpt-4o-mini" for faster/lower cost
                 messages=messages,
                 stream=True,
-                max_tokens=500  # Keep responses concise for voice
+                max_tokens=max_tokens,  # Keep responses concise for voice
+                stop=["\n\n"],  # One spoken paragraph per turn
+                stream_options={"include_usage": True}  # Usage on the last chunk
             )
             
+            # Speak each sentence as soon as it completes instead of waiting
+            # for the full response. A single consumer keeps sentences in
+            # order (one ElevenLabs stream at a time).
+            tts_queue = asyncio.Queue()
+            self.tts_queue = tts_queue
+            tts_task = asyncio.create_task(self._tts_consumer(tts_queue))
+            self._tts_task = tts_task
+            
+            # Collect deltas in a list and join once (avoids quadratic concat)
+            parts = []
+            append = parts.append
+            sentence_buffer = ""
+            usage = None
             async for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    text = chunk.choices[0].delta.content
-                    self.llm_response_buffer += text
+                if chunk.usage:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue  # Usage-only final chunk
+                text = chunk.choices[0].delta.content
+                if text:
+                    append(text)
+                    sentence_buffer += text
+                    sentence, sentence_buffer = _split_sentence(sentence_buffer)
+                    if sentence:
+                        tts_queue.put_nowait(sentence)
+            
+            if sentence_buffer.strip():
+                tts_queue.put_nowait(sentence_buffer.strip())
+            tts_queue.put_nowait(None)
+            self.llm_response_buffer = "".join(parts)
             
-            # Process TTS
-            if self.llm_response_buffer and not self.barge_in_detected:
-                await self._process_tts(self.llm_response_buffer)
+            if usage:
+                self.cost_tracker.track_usage(
+                    user_id=self.session.user_id,
+                    text_tokens=usage.total_tokens
+                )
+            
+            # Wait for the remaining sentences to be spoken
+            await tts_task
             
             self.llm_response_buffer = ""
             
+        except asyncio.CancelledError:
+            # Barge-in: stop pulling tokens from OpenAI
+            self.llm_response_buffer = ""
+            if stream is not None:
+                await stream.close()
+            raise
         except Exception as e:
             print(f"[LS1A] LLM error: {e}")
+            # Let the consumer finish whatever was already queued
+            if tts_queue is not None:
+                tts_queue.put_nowait(None)
             if self.on_error:
                 self.on_error(e)
     
+    async def _tts_consumer(self, queue: asyncio.Queue):
+        """
+        Speak queued sentences in order until a None sentinel arrives.
+        
+        Args:
+            queue: Queue of sentences produced by _process_llm
+        """
+        while True:
+            sentence = await queue.get()
+            if sentence is None:
+                break
+            await self._process_tts(sentence)
+    
     async def _process_tts(self, text: str):
         """
         Process text with ElevenLabs streaming TTS.
@@ -263,6 +509,7 @@ class LS1APipeline:
         Args:
             text: Text to convert to speech
         """
+        audio_stream = None
         try:
             # Check if barge-in occurred
             if self.barge_in_detected:
@@ -277,7 +524,8 @@ class LS1APipeline:
             audio_stream = await self.elevenlabs.text_to_speech.convert_as_stream(
                 voice_id=voice_id,
                 model_id=model_id,
-                text=text
+                text=text,
+                output_format=TTS_OUTPUT_FORMAT
             )
             
             # Stream audio chunks
@@ -293,9 +541,17 @@ class LS1APipeline:
                 # Track audio time
                 self._track_audio_time(len(audio_chunk))
             
+            self._flush_audio_usage()
             self.is_speaking = False
             self.barge_in_detected = False
             
+        except asyncio.CancelledError:
+            # Barge-in: stop the ElevenLabs stream
+            self.is_speaking = False
+            self._flush_audio_usage()
+            if hasattr(audio_stream, "aclose"):
+                await audio_stream.aclose()
+            raise
         except Exception as e:
             print(f"[LS1A] TTS error: {e}")
             self.is_speaking = False
@@ -303,27 +559,67 @@ class LS1APipeline:
                 self.on_error(e)
     
     def _update_session_transcript(self, text: str, is_final: bool):
-        """Update session transcript in storage."""
+        """
+        Update session transcript in storage.
+        
+        Only finalized text is stored. The full transcript is written at
+        most every TRANSCRIPT_CHECKPOINT_INTERVAL seconds so long sessions
+        don't rewrite it per utterance; close() writes the final one.
+        """
+        if not is_final:
+            return
         try:
-            if is_final:
-                # Append to partial transcript
-                current = self.session.transcript_partial
-                updated = current + " " + text if current else text
-                self.session_storage.update(
-                    self.session.id,
-                    self.session.user_id,
-                    {"transcript_partial": updated}
-                )
-            else:
-                # Update partial transcript
-                self.session_storage.update(
-                    self.session.id,
-                    self.session.user_id,
-                    {"transcript_partial": text}
-                )
+            self._transcript_parts.append(text)
+            now = time.monotonic()
+            if now - self._transcript_checkpoint_ts >= TRANSCRIPT_CHECKPOINT_INTERVAL:
+                self._transcript_checkpoint_ts = now
+                self._schedule_storage_update({"transcript_partial": " ".join(self._transcript_parts)})
         except Exception as e:
             print(f"[LS1A] Error updating transcript: {e}")
     
+    def _schedule_storage_update(self, patch: Dict[str, Any]):
+        """
+        Queue a session storage update without blocking the event loop.
+        
+        Patches issued while a write is in flight are merged and written
+        together once it finishes, so a burst becomes a single write.
+        
+        Args:
+            patch: Fields to update on the session
+        """
+        self._pending_storage_patch.update(patch)
+        if self._storage_task is None or self._storage_task.done():
+            self._storage_task = asyncio.create_task(self._drain_storage_updates())
+    
+    async def _drain_storage_updates(self):
+        """Write merged storage patches until none are pending."""
+        while self._pending_storage_patch:
+            patch = self._pending_storage_patch
+            self._pending_storage_patch = {}
+            try:
+                await self._storage_update_async(patch)
+            except Exception as e:
+                print(f"[LS1A] Error updating session: {e}")
+    
+    async def _storage_update_async(self, patch: Dict[str, Any]):
+        """
+        Apply a session storage update in a worker thread.
+        
+        Args:
+            patch: Fields to update on the session
+        """
+        await asyncio.to_thread(
+            self.session_storage.update,
+            self.session.id,
+            self.session.user_id,
+            patch
+        )
+    
+    @property
+    def total_audio_seconds(self) -> float:
+        """Total TTS audio duration in seconds."""
+        return self.total_audio_bytes / TTS_BYTES_PER_SECOND
+    
     def _track_audio_time(self, audio_bytes: int):
         """
         Track audio time for budget enforcement.
@@ -331,27 +627,35 @@ class LS1APipeline:
         Args:
             audio_bytes: Size of audio chunk in bytes
         """
-        # Estimate audio duration (assuming 24kHz, 16-bit, mono)
-        # bytes / (sample_rate * channels * bytes_per_sample)
-        duration_seconds = audio_bytes / (24000 * 1 * 2)  # 24kHz, mono, 16-bit
-        self.total_audio_seconds += duration_seconds
+        # Accumulate raw bytes as an integer so long sessions don't drift;
+        # durations are derived from the byte count only when needed
+        self.total_audio_bytes += audio_bytes
+        
+        # Coalesce storage/cost updates instead of writing per chunk
+        if (self.total_audio_bytes - self._flushed_audio_bytes >= AUDIO_FLUSH_BYTES or
+                time.monotonic() - self._last_flush_ts >= AUDIO_FLUSH_INTERVAL):
+            self._flush_audio_usage()
+    
+    def _flush_audio_usage(self):
+        """Record audio not yet flushed in session storage and cost tracker."""
+        pending_bytes = self.total_audio_bytes - self._flushed_audio_bytes
+        if pending_bytes <= 0:
+            return
+        self._flushed_audio_bytes = self.total_audio_bytes
+        self._last_flush_ts = time.monotonic()
         
         # Update session
-        audio_minutes = self.total_audio_seconds / 60.0
-        self.session_storage.update(
-            self.session.id,
-            self.session.user_id,
-            {"audio_minutes_used": audio_minutes}
-        )
+        audio_minutes = self.total_audio_bytes / TTS_BYTES_PER_MINUTE
+        self._schedule_storage_update({"audio_minutes_used": audio_minutes})
         
         # Track in cost tracker
         self.cost_tracker.track_usage(
             user_id=self.session.user_id,
-            audio_minutes=duration_seconds / 60.0
+            audio_minutes=pending_bytes / TTS_BYTES_PER_MINUTE
         )
         
         # Check budget
-        budget_status = self.cost_tracker.get_budget_status(self.session.user_id)
+        budget_status = self._cached_budget_status()
         audio_utilization = budget_status.get("audio_minutes", {}).get("utilization", 0)
         
         # Warning at 80%
@@ -363,16 +667,31 @@ class LS1APipeline:
         if audio_utilization >= 1.0:
             asyncio.create_task(self._handle_budget_exhausted())
     
+    def _cached_budget_status(self) -> Dict[str, Any]:
+        """
+        Get budget status, reusing a recent lookup.
+        
+        The 80%/100% thresholds tolerate BUDGET_STATUS_TTL of staleness, so
+        this avoids walking the cost tracker on every flush and utterance.
+        
+        Returns:
+            Budget status dict from the cost tracker
+        """
+        fetched_at, status = self._budget_cache
+        now = time.monotonic()
+        if fetched_at and now - fetched_at < BUDGET_STATUS_TTL:
+            return status
+        status = self.cost_tracker.get_budget_status(self.session.user_id)
+        self._budget_cache = (now, status)
+        return status
+    
     async def _handle_budget_exhausted(self):
         """Handle budget exhaustion by pausing session."""
         print(f"[LS1A] Budget exhausted for session {self.session.id}")
+        self._budget_cache = (0.0, {})
         
         # Pause session
-        self.session_storage.update(
-            self.session.id,
-            self.session.user_id,
-            {"state": "PAUSED"}
-        )
+        self._schedule_storage_update({"state": "PAUSED"})
         
         # Notify via callback
         if self.on_budget_warning:
@@ -380,18 +699,33 @@ class LS1APipeline:
     
     async def send_audio(self, audio_data: bytes):
         """
-        Send audio data to Deepgram for transcription.
+        Queue audio data for transcription by Deepgram.
+        
+        Waits while the send queue is full, so a slow Deepgram link slows
+        the caller down rather than buffering without bound.
         
         Args:
             audio_data: Raw PCM audio bytes (16-bit, 16kHz, mono)
         """
-        if hasattr(self, 'deepgram_connection') and self.deepgram_connection:
+        if self.deepgram_connection:
+            await self._dg_send_q.put(audio_data)
+    
+    async def _dg_sender_loop(self):
+        """Forward queued audio to Deepgram, merging any backlog into one send."""
+        queue = self._dg_send_q
+        while True:
+            chunks = [await queue.get()]
+            while len(chunks) < DEEPGRAM_SEND_COALESCE and not queue.empty():
+                chunks.append(queue.get_nowait())
+            
+            connection = self.deepgram_connection
+            if not connection:
+                continue
             try:
-                self.deepgram_connection.send(audio_data)
+                await connection.send(chunks[0] if len(chunks) == 1 else b"".join(chunks))
             except Exception as e:
                 print(f"[LS1A] Error sending audio to Deepgram: {e}")
-                if self.on_error:
-                    await self._call_callback(self.on_error, e)
+                self._dispatch(self.on_error, e)
     
     async def close(self):
         """Close pipeline and cleanup."""
@@ -399,14 +733,158 @@ class LS1APipeline:
         self.is_listening = False
         self.barge_in_detected = False
         
+        self._cancel_response()
+        self._flush_audio_usage()
+        if self._dg_sender and not self._dg_sender.done():
+            self._dg_sender.cancel()
+        self._dg_sender = None
+        
+        # Release per-session resources so closed pipelines don't pin them
+        self.tts_queue = asyncio.Queue()
+        self.llm_response_buffer = ""
+        self._dg_send_q = asyncio.Queue(maxsize=DEEPGRAM_SEND_QUEUE_SIZE)
+        connection = self.deepgram_connection
+        self.deepgram_connection = None
+        if self._deepgram_route:
+            self._deepgram_route.pipeline = None  # Drop late events
+            self._deepgram_route = None
+        if connection:
+            try:
+                await connection.finish()
+            except Exception as e:
+                print(f"[LS1A] Error closing Deepgram connection: {e}")
+        
+        # Let queued writes land before the final one
+        if self._storage_task and not self._storage_task.done():
+            await self._storage_task
+        
         # Finalize transcript
-        if self.session.transcript_partial:
-            self.session_storage.update(
-                self.session.id,
-                self.session.user_id,
-                {
-                    "transcript_final": self.session.transcript_partial,
-                    "state": "ENDED"
-                }
-            )
+        if self._transcript_parts:
+            transcript = " ".join(self._transcript_parts)
+            self._transcript_parts = []
+            await self._storage_update_async({
+                "transcript_partial": transcript,
+                "transcript_final": transcript,
+                "state": "ENDED"
+            })
 
+
+class DeepgramConnectionPool:
+    """
+    Keeps a few Deepgram live connections open ahead of demand.
+    
+    Taking a connection from the pool removes the handshake from session
+    start. Connections are single-use: once a pipeline has streamed audio
+    through one it is finished on close, never returned, since Deepgram
+    keeps per-stream state. Idle pooled connections get KeepAlive messages
+    and are replaced after DEEPGRAM_POOL_MAX_AGE.
+    """
+    
+    def __init__(
+        self,
+        deepgram_api_key: Optional[str] = None,
+        size: int = DEEPGRAM_POOL_SIZE,
+        max_age: float = DEEPGRAM_POOL_MAX_AGE
+    ):
+        """
+        Initialize Deepgram connection pool.
+        
+        Args:
+            deepgram_api_key: Deepgram API key (defaults to env var)
+            size: Number of connections to keep open
+            max_age: Seconds before an unused connection is replaced
+        """
+        self.deepgram_api_key = deepgram_api_key or os.getenv("DEEPGRAM_API_KEY")
+        self.size = size
+        self.max_age = max_age
+        self._deepgram: Optional[DeepgramClient] = None
+        self._ready: list = []  # (opened_at, connection, route)
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start filling the pool (no-op if disabled or already running)."""
+        if self.size <= 0 or not self.deepgram_api_key:
+            return
+        if self._task and not self._task.done():
+            return
+        self._deepgram = self._deepgram or DeepgramClient(self.deepgram_api_key)
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._maintain())
+    
+    def acquire(self) -> Optional[Tuple[Any, _DeepgramRoute]]:
+        """
+        Take a ready connection from the pool.
+        
+        Returns:
+            (connection, route) tuple, or None if no fresh connection is ready
+        """
+        now = time.monotonic()
+        while self._ready:
+            opened_at, connection, route = self._ready.pop()
+            if now - opened_at < self.max_age and not route.closed:
+                if self._wake:
+                    self._wake.set()  # Refill right away
+                return connection, route
+            asyncio.create_task(self._finish(connection))
+        return None
+    
+    async def _maintain(self):
+        """Top up the pool and keep idle connections alive."""
+        while True:
+            # Sort without awaiting so acquire() never sees a half-updated list
+            now = time.monotonic()
+            fresh, stale = [], []
+            for entry in self._ready:
+                opened_at, connection, route = entry
+                if now - opened_at >= self.max_age or route.closed:
+                    stale.append(connection)
+                else:
+                    fresh.append(entry)
+            self._ready = fresh
+            
+            for entry in list(fresh):
+                if entry not in self._ready:
+                    continue  # Handed out while an earlier keep-alive was awaited
+                _, connection, route = entry
+                try:
+                    await connection.keep_alive()
+                except Exception as e:
+                    print(f"[LS1A] Deepgram keep-alive failed, dropping connection: {e}")
+                    route.closed = True
+                if route.closed and entry in self._ready:
+                    self._ready.remove(entry)
+                    stale.append(connection)
+            for connection in stale:
+                await self._finish(connection)
+            
+            while len(self._ready) < self.size:
+                try:
+                    route = _DeepgramRoute()
+                    connection = await _open_deepgram_connection(self._deepgram, route)
+                except Exception as e:
+                    print(f"[LS1A] Error pre-warming Deepgram connection: {e}")
+                    break
+                self._ready.append((time.monotonic(), connection, route))
+            
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), DEEPGRAM_KEEPALIVE_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def _finish(self, connection):
+        """Close a connection, ignoring errors from already-dead sockets."""
+        try:
+            await connection.finish()
+        except Exception as e:
+            print(f"[LS1A] Error closing Deepgram connection: {e}")
+    
+    async def close(self):
+        """Stop refilling and close pooled connections."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        ready, self._ready = self._ready, []
+        for _, connection, _ in ready:
+            await self._finish(connection)
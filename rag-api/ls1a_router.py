@@ -29,9 +29,9 @@ async def ls1a_websocket(
         - close (text JSON): {"type": "close"} - Close session
     
     Response Types (to client):
-        - ready: {"type": "ready", "session_id": "...", "message": "..."}
+        - ready: {"type": "ready", "session_id": "...", "message": "...", "audio_format": "pcm_s16le_24000"}
         - transcript: {"type": "transcript", "text": "...", "is_final": bool}
-        - audio_chunk: {"type": "audio_chunk", "data": "base64...", "format": "mp3"}
+        - audio_chunk (binary): Raw TTS audio bytes in the announced audio_format
         - budget_warning: {"type": "budget_warning", "utilization": 0.85, "message": "..."}
         - session_paused: {"type": "session_paused", "reason": "budget_exhausted"}
         - error: {"type": "error", "message": "..."}
@@ -8,11 +8,30 @@ from fastapi import WebSocket, WebSocketDisconnect, HTTPException, Query
 from typing import Optional
 import asyncio
 import json
-import base64
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 from .models import LiveSession
 from .live_session_storage import LiveSessionStorage, InMemoryLiveSessionStorage
 from .cost import CostTracker
-from .ls1a_pipeline import LS1APipeline
+from .ls1a_pipeline import LS1APipeline, DeepgramConnectionPool, TTS_AUDIO_FORMAT
+
+
+def _dumps(data: dict) -> str:
+    """Serialize a control/transcript message for a text frame."""
+    if HAS_ORJSON:
+        return orjson.dumps(data).decode()
+    return json.dumps(data)
+
+
+def _loads(text: str) -> dict:
+    """Parse a control message from a text frame."""
+    if HAS_ORJSON:
+        return orjson.loads(text)
+    return json.loads(text)
 
 
 class LS1AWebSocketHandler:
@@ -41,6 +60,7 @@ class LS1AWebSocketHandler:
         self.session_storage = session_storage or InMemoryLiveSessionStorage()
         self.cost_tracker = cost_tracker or CostTracker()
         self.active_pipelines: dict[str, LS1APipeline] = {}
+        self.deepgram_pool = DeepgramConnectionPool()  # Started on first connection
     
     async def handle_websocket(
         self,
@@ -74,11 +94,11 @@ class LS1AWebSocketHandler:
             updated = self.session_storage.update(session_id, user_id, {"state": "LIVE"})
             if updated:
                 session = updated
-                await websocket.send_json({
+                await websocket.send_text(_dumps({
                     "type": "session_started",
                     "session_id": session_id,
                     "state": "LIVE"
-                })
+                }))
             else:
                 await websocket.close(code=1008, reason="Failed to start session")
                 return
@@ -89,6 +109,7 @@ class LS1AWebSocketHandler:
             return
         
         # Initialize pipeline
+        writer_task: Optional[asyncio.Task] = None
         try:
             pipeline = LS1APipeline(
                 session=session,
@@ -96,32 +117,38 @@ class LS1AWebSocketHandler:
                 cost_tracker=self.cost_tracker
             )
             
-            # Set up callbacks
-            pipeline.on_transcript = lambda text, is_final: asyncio.create_task(
-                self._send_transcript(websocket, text, is_final)
+            # Set up callbacks: enqueue outbound messages for a single writer
+            # task instead of creating a task per transcript/audio chunk
+            out_queue: asyncio.Queue = asyncio.Queue()
+            writer_task = asyncio.create_task(self._writer_loop(websocket, out_queue))
+            
+            pipeline.on_transcript = lambda text, is_final: out_queue.put_nowait(
+                (self._send_transcript, (text, is_final))
             )
-            pipeline.on_audio_chunk = lambda audio_bytes: asyncio.create_task(
-                self._send_audio_chunk(websocket, audio_bytes)
+            pipeline.on_audio_chunk = lambda audio_bytes: out_queue.put_nowait(
+                (self._send_audio_chunk, (audio_bytes,))
             )
-            pipeline.on_budget_warning = lambda utilization: asyncio.create_task(
-                self._send_budget_warning(websocket, utilization)
+            pipeline.on_budget_warning = lambda utilization: out_queue.put_nowait(
+                (self._send_budget_warning, (utilization,))
             )
-            pipeline.on_error = lambda error: asyncio.create_task(
-                self._send_error(websocket, error)
+            pipeline.on_error = lambda error: out_queue.put_nowait(
+                (self._send_error, (error,))
             )
             
-            # Connect to Deepgram
-            deepgram_connection = await pipeline.connect_deepgram()
+            # Connect to Deepgram (pre-warmed connection when available)
+            self.deepgram_pool.start()
+            deepgram_connection = await pipeline.connect_deepgram(self.deepgram_pool)
             
             # Store pipeline
             self.active_pipelines[session_id] = pipeline
             
             # Send ready message
-            await websocket.send_json({
+            await websocket.send_text(_dumps({
                 "type": "ready",
                 "session_id": session_id,
-                "message": "LS1A pipeline ready"
-            })
+                "message": "LS1A pipeline ready",
+                "audio_format": TTS_AUDIO_FORMAT
+            }))
             
             # Main loop
             try:
@@ -131,7 +158,7 @@ class LS1AWebSocketHandler:
                     
                     if "text" in message:
                         # Text message (control)
-                        data = json.loads(message["text"])
+                        data = _loads(message["text"])
                         await self._handle_control_message(websocket, pipeline, data)
                     
                     elif "bytes" in message:
@@ -143,6 +170,7 @@ class LS1AWebSocketHandler:
                 print(f"[LS1A] WebSocket disconnected for session {session_id}")
             finally:
                 # Cleanup
+                writer_task.cancel()
                 await pipeline.close()
                 if session_id in self.active_pipelines:
                     del self.active_pipelines[session_id]
@@ -152,8 +180,29 @@ class LS1AWebSocketHandler:
         
         except Exception as e:
             print(f"[LS1A] Pipeline error: {e}")
+            if writer_task:
+                writer_task.cancel()
             await websocket.close(code=1011, reason=f"Pipeline error: {str(e)}")
     
+    async def close(self):
+        """Close pre-warmed Deepgram connections."""
+        await self.deepgram_pool.close()
+    
+    async def _writer_loop(self, websocket: WebSocket, out_queue: asyncio.Queue):
+        """
+        Single writer for pipeline output.
+        
+        Serializes all callback-driven sends on one task so concurrent
+        transcript/audio/budget messages never interleave on the socket.
+        
+        Args:
+            websocket: WebSocket connection
+            out_queue: Queue of (send_method, args) tuples
+        """
+        while True:
+            send, args = await out_queue.get()
+            await send(websocket, *args)
+    
     async def _handle_control_message(
         self,
         websocket: WebSocket,
@@ -170,7 +219,7 @@ class LS1AWebSocketHandler:
                 pipeline.session.user_id,
                 {"state": "PAUSED"}
             )
-            await websocket.send_json({"type": "session_paused"})
+            await websocket.send_text(_dumps({"type": "session_paused"}))
         
         elif msg_type == "resume":
             # Resume session
@@ -179,7 +228,7 @@ class LS1AWebSocketHandler:
                 pipeline.session.user_id,
                 {"state": "LIVE"}
             )
-            await websocket.send_json({"type": "session_resumed"})
+            await websocket.send_text(_dumps({"type": "session_resumed"}))
         
         elif msg_type == "close":
             # Close session
@@ -187,66 +236,52 @@ class LS1AWebSocketHandler:
             await websocket.close(code=1000, reason="Session closed by client")
     
     async def _handle_audio_chunk(self, pipeline: LS1APipeline, audio_data: bytes):
-        """Handle audio chunk from client."""
-        # Decode if base64 (common in WebSocket)
-        try:
-            # Try base64 decode
-            audio_bytes = base64.b64decode(audio_data)
-        except:
-            # Assume raw bytes
-            audio_bytes = audio_data
-        
-        # Send to Deepgram
-        await pipeline.send_audio(audio_bytes)
+        """Handle audio chunk from client (raw PCM from a binary frame)."""
+        await pipeline.send_audio(audio_data)
     
     async def _send_transcript(self, websocket: WebSocket, text: str, is_final: bool):
         """Send transcript to client."""
         try:
-            await websocket.send_json({
+            await websocket.send_text(_dumps({
                 "type": "transcript",
                 "text": text,
                 "is_final": is_final
-            })
+            }))
         except:
             pass  # WebSocket may be closed
     
     async def _send_audio_chunk(self, websocket: WebSocket, audio_bytes: bytes):
-        """Send audio chunk to client."""
+        """Send audio chunk to client as a binary frame."""
         try:
-            # Encode as base64 for JSON
-            audio_b64 = base64.b64encode(audio_bytes).decode("utf-8")
-            await websocket.send_json({
-                "type": "audio_chunk",
-                "data": audio_b64,
-                "format": "mp3"  # ElevenLabs returns MP3
-            })
+            # Raw bytes; the codec is announced once in the ready message
+            await websocket.send_bytes(audio_bytes)
         except:
             pass  # WebSocket may be closed
     
     async def _send_budget_warning(self, websocket: WebSocket, utilization: float):
         """Send budget warning to client."""
         try:
-            await websocket.send_json({
+            await websocket.send_text(_dumps({
                 "type": "budget_warning",
                 "utilization": utilization,
                 "message": f"Audio budget at {utilization:.1%}"
-            })
+            }))
             
             if utilization >= 1.0:
-                await websocket.send_json({
+                await websocket.send_text(_dumps({
                     "type": "session_paused",
                     "reason": "budget_exhausted"
-                })
+                }))
         except:
             pass  # WebSocket may be closed
     
     async def _send_error(self, websocket: WebSocket, error: Exception):
         """Send error to client."""
         try:
-            await websocket.send_json({
+            await websocket.send_text(_dumps({
                 "type": "error",
                 "message": str(error)
-            })
+            }))
         except:
             pass  # WebSocket may be closed
 
@@ -275,10 +310,15 @@ async def ls1a_websocket_endpoint(
     Response Types:
         - ready: Pipeline ready
         - transcript: Transcript update (partial or final)
-        - audio_chunk: TTS audio chunk (base64 MP3)
+        - audio_chunk (binary): TTS audio chunk (format given in ready message)
         - budget_warning: Budget utilization warning
         - session_paused: Session paused (budget or manual)
         - error: Error message
     """
     await _handler.handle_websocket(websocket, session_id, user_id)
 
+
+async def close_ls1a_handler():
+    """Release resources held by the global LS1A handler (call on shutdown)."""
+    await _handler.close()
+
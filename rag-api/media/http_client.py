@@ -0,0 +1,21 @@
+"""
+Shared HTTP Client Settings
+
+TLS and JSON settings shared by the media integrations' aiohttp sessions.
+"""
+
+from typing import Any
+import ssl
+
+import orjson
+
+
+# One context for every outbound connector. Each SSLContext loads the CA
+# bundle from disk when created; aiohttp builds a fresh default one per
+# connector unless given this.
+SSL_CONTEXT = ssl.create_default_context()
+
+
+def json_dumps(obj: Any) -> str:
+    """Serialize request bodies with orjson (aiohttp's json_serialize)."""
+    return orjson.dumps(obj).decode()
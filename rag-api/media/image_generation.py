@@ -5,10 +5,13 @@ Supports multiple image generation APIs (OpenAI DALL-E, Stability AI, etc.)
 """
 
 from typing import Optional, List, Dict, Any
+import asyncio
 import os
 import base64
 from io import BytesIO
 
+from .http_client import SSL_CONTEXT
+
 try:
     from openai import AsyncOpenAI
     HAS_OPENAI = True
@@ -16,10 +19,40 @@ except ImportError:
     HAS_OPENAI = False
 
 try:
-    import requests
-    HAS_REQUESTS = True
+    import aiohttp
+    HAS_AIOHTTP = True
 except ImportError:
-    HAS_REQUESTS = False
+    HAS_AIOHTTP = False
+
+
+# Replicate polling: backoff doubles from 0.25s up to 3s per attempt
+REPLICATE_POLL_ATTEMPTS = 30
+REPLICATE_POLL_BASE_DELAY = 0.25
+REPLICATE_POLL_MAX_DELAY = 3.0
+
+# Max concurrent provider requests when generating several images
+PROVIDER_CONCURRENCY = 8
+
+# Shared HTTP session for Stability/Replicate (keeps connections and DNS warm)
+_http_session: Optional["aiohttp.ClientSession"] = None
+
+
+async def _get_http_session() -> "aiohttp.ClientSession":
+    """Get the shared aiohttp session, creating it inside the running loop."""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=300, ssl=SSL_CONTEXT)
+        )
+    return _http_session
+
+
+async def close_http_session():
+    """Close the shared aiohttp session (call on shutdown)."""
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
 
 
 class ImageGenerator:
@@ -100,11 +133,12 @@ class ImageGenerator:
             "1024x1792": "1024x1792"
         }
         openai_size = size_map.get(size, "1024x1024")
+        model = "dall-e-3" if size in ("1792x1024", "1024x1792") else "dall-e-2"
         
         response = await self.client.images.generate(
-            model="dall-e-3" if size in ["1792x1024", "1024x1792"] else "dall-e-2",
+            model=model,
             prompt=prompt,
-            n=1 if "dall-e-3" in str(response.model) else n,  # DALL-E 3 only supports n=1
+            n=1 if model == "dall-e-3" else n,  # DALL-E 3 only supports n=1
             size=openai_size,
             quality=quality if quality == "hd" else "standard",
             response_format="url"
@@ -116,7 +150,7 @@ class ImageGenerator:
                 "url": img.url,
                 "revised_prompt": getattr(img, "revised_prompt", None),
                 "provider": "openai",
-                "model": "dall-e-3" if "dall-e-3" in str(response.model) else "dall-e-2"
+                "model": model
             })
         
         return images
@@ -129,10 +163,8 @@ class ImageGenerator:
         style: Optional[str]
     ) -> List[Dict[str, Any]]:
         """Generate images using Stability AI."""
-        if not HAS_REQUESTS:
-            raise ImportError("requests package is required. Install with: pip install requests")
-        
-        import aiohttp
+        if not HAS_AIOHTTP:
+            raise ImportError("aiohttp package is required. Install with: pip install aiohttp")
         
         # Map size to Stability format
         width, height = map(int, size.split("x"))
@@ -143,35 +175,42 @@ class ImageGenerator:
             "Accept": "image/*"
         }
         
+        # One image per request; the n samples are separate concurrent requests
         data = {
             "prompt": prompt,
             "output_format": "png",
             "width": width,
-            "height": height,
-            "samples": n
+            "height": height
         }
         
         if style:
             data["style_preset"] = style
         
-        images = []
-        async with aiohttp.ClientSession() as session:
-            for _ in range(n):
-                async with session.post(url, headers=headers, data=data) as response:
-                    if response.status == 200:
-                        image_data = await response.read()
-                        # Convert to base64
-                        b64 = base64.b64encode(image_data).decode()
-                        images.append({
-                            "b64_json": b64,
-                            "provider": "stability",
-                            "format": "png"
-                        })
-                    else:
-                        error = await response.text()
-                        raise Exception(f"Stability AI error: {error}")
-        
-        return images
+        session = await _get_http_session()
+        return await self._gather_samples(
+            n, lambda: self._one_stability(session, url, headers, data)
+        )
+    
+    async def _one_stability(
+        self,
+        session,
+        url: str,
+        headers: Dict[str, str],
+        data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Request a single image from Stability AI."""
+        async with session.post(url, headers=headers, data=data) as response:
+            if response.status == 200:
+                image_data = await response.read()
+                # Convert to base64
+                b64 = base64.b64encode(image_data).decode()
+                return {
+                    "b64_json": b64,
+                    "provider": "stability",
+                    "format": "png"
+                }
+            error = await response.text()
+            raise Exception(f"Stability AI error: {error}")
     
     async def _generate_replicate(
         self,
@@ -180,10 +219,8 @@ class ImageGenerator:
         n: int
     ) -> List[Dict[str, Any]]:
         """Generate images using Replicate."""
-        if not HAS_REQUESTS:
-            raise ImportError("requests package is required. Install with: pip install requests")
-        
-        import aiohttp
+        if not HAS_AIOHTTP:
+            raise ImportError("aiohttp package is required. Install with: pip install aiohttp")
         
         # Use Stable Diffusion model
         model = "stability-ai/stable-diffusion:db21e45d3f7023abc2a46ee38a23973f6dce16bb082a930b0c49861f96d1e5bf"
@@ -196,51 +233,128 @@ class ImageGenerator:
         
         width, height = map(int, size.split("x"))
         
-        images = []
-        async with aiohttp.ClientSession() as session:
-            for _ in range(n):
-                payload = {
-                    "version": model.split(":")[1] if ":" in model else model,
-                    "input": {
-                        "prompt": prompt,
-                        "width": width,
-                        "height": height
-                    }
-                }
-                
-                async with session.post(url, headers=headers, json=payload) as response:
-                    if response.status == 201:
-                        prediction = await response.json()
-                        # Poll for completion
-                        prediction_url = prediction.get("urls", {}).get("get")
-                        if prediction_url:
-                            # Wait for completion (simplified - in production use proper polling)
-                            import asyncio
-                            await asyncio.sleep(5)
-                            
-                            async with session.get(prediction_url, headers=headers) as poll_response:
-                                result = await poll_response.json()
-                                if result.get("status") == "succeeded":
-                                    output_url = result.get("output", [""])[0]
-                                    images.append({
-                                        "url": output_url,
-                                        "provider": "replicate",
-                                        "model": model
-                                    })
-                    else:
-                        error = await response.text()
-                        raise Exception(f"Replicate error: {error}")
+        payload = {
+            "version": model.split(":")[1] if ":" in model else model,
+            "input": {
+                "prompt": prompt,
+                "width": width,
+                "height": height
+            }
+        }
         
-        return images
+        session = await _get_http_session()
+        images = await self._gather_samples(
+            n, lambda: self._one_replicate(session, url, headers, payload, model)
+        )
+        return [image for image in images if image]
+    
+    async def _one_replicate(
+        self,
+        session,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        model: str
+    ) -> Optional[Dict[str, Any]]:
+        """Create a single Replicate prediction and wait for its output."""
+        async with session.post(url, headers=headers, json=payload) as response:
+            if response.status != 201:
+                error = await response.text()
+                raise Exception(f"Replicate error: {error}")
+            prediction = await response.json()
+        
+        # Poll for completion
+        prediction_url = prediction.get("urls", {}).get("get")
+        if not prediction_url:
+            return None
+        result = await self._poll_replicate(session, prediction_url, headers)
+        output_url = result.get("output", [""])[0]
+        return {
+            "url": output_url,
+            "provider": "replicate",
+            "model": model
+        }
+    
+    async def _gather_samples(self, n: int, make_request) -> List[Any]:
+        """
+        Run n independent sample requests concurrently.
+        
+        At most PROVIDER_CONCURRENCY run at once. Failed samples are
+        dropped as long as at least one succeeds; if all fail, the first
+        error is raised.
+        
+        Args:
+            n: Number of samples
+            make_request: Zero-argument callable returning a request coroutine
+        
+        Returns:
+            Results of the successful requests, in request order
+        """
+        semaphore = asyncio.Semaphore(PROVIDER_CONCURRENCY)
+        
+        async def run():
+            async with semaphore:
+                return await make_request()
+        
+        results = await asyncio.gather(*[run() for _ in range(n)], return_exceptions=True)
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors and len(errors) == len(results):
+            raise errors[0]
+        for error in errors:
+            print(f"Image sample failed ({self.provider}): {error}")
+        return [r for r in results if not isinstance(r, BaseException)]
+    
+    async def _poll_replicate(
+        self,
+        session,
+        prediction_url: str,
+        headers: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """
+        Poll a Replicate prediction until it finishes.
+        
+        Backs off exponentially (0.25s, 0.5s, ... capped at 3s) and honors
+        Retry-After when Replicate sends it.
+        
+        Args:
+            session: aiohttp client session
+            prediction_url: Prediction status URL from the create response
+            headers: Request headers (auth)
+        
+        Returns:
+            Succeeded prediction result
+        """
+        for attempt in range(REPLICATE_POLL_ATTEMPTS):
+            async with session.get(prediction_url, headers=headers) as poll_response:
+                result = await poll_response.json()
+                retry_after = poll_response.headers.get("Retry-After")
+            
+            status = result.get("status")
+            if status == "succeeded":
+                return result
+            if status in ("failed", "canceled"):
+                raise Exception(f"Replicate prediction {status}: {result.get('error')}")
+            
+            delay = min(REPLICATE_POLL_BASE_DELAY * (2 ** attempt), REPLICATE_POLL_MAX_DELAY)
+            if retry_after:
+                try:
+                    delay = max(delay, float(retry_after))
+                except ValueError:
+                    pass
+            await asyncio.sleep(delay)
+        
+        raise Exception("Replicate prediction timed out")
 
 
-# Global instance
-_image_generator: Optional[ImageGenerator] = None
+# Global instances (one per provider)
+_image_generators: Dict[str, ImageGenerator] = {}
 
 def get_image_generator(provider: Optional[str] = None) -> ImageGenerator:
     """Get image generator instance."""
-    global _image_generator
-    if _image_generator is None or (provider and _image_generator.provider != provider):
-        _image_generator = ImageGenerator(provider=provider or os.getenv("IMAGE_GENERATION_PROVIDER", "openai"))
-    return _image_generator
-
+    provider = provider or os.getenv("IMAGE_GENERATION_PROVIDER", "openai")
+    
+    # No await between lookup and insert, so this is atomic on the event loop
+    if provider not in _image_generators:
+        _image_generators[provider] = ImageGenerator(provider=provider)
+    
+    return _image_generators[provider]
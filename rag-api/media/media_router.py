@@ -2,17 +2,56 @@
 Media Integration REST API Router
 """
 
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
+from fastapi import APIRouter, HTTPException, UploadFile, File, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
+import asyncio
+import os
+
+import orjson
+
+from .image_generation import get_image_generator
+from .spotify_integration import get_spotify_client
+from .music_creation import get_music_creator
+from .sound_effects import get_sound_effects_manager, MAX_SOUND_UPLOAD_BYTES
+from .social_media import get_social_media_controller
+from ..cache.response_cache import cached, invalidate_cached
+
+
+class MediaRoute(APIRoute):
+    """
+    Route that reports unexpected handler errors as HTTP 500.
+    
+    Replaces a try/except in every endpoint. The error becomes an
+    HTTPException so it is answered inside the middleware stack (CORS
+    headers, monitoring) rather than by the app's outermost error handler.
+    """
+    
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        
+        async def route_handler(request: Request) -> Response:
+            try:
+                return await handler(request)
+            except (StarletteHTTPException, RequestValidationError):
+                raise
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
+        
+        return route_handler
 
-from .image_generation import ImageGenerator, get_image_generator
-from .spotify_integration import SpotifyClient, get_spotify_client
-from .music_creation import MusicCreator, get_music_creator
-from .sound_effects import SoundEffectsManager, get_sound_effects_manager
-from .social_media import SocialMediaController, get_social_media_controller
 
-router = APIRouter(prefix="/media", tags=["media"])
+# orjson serializes long prompts/base64 image payloads and listings much faster
+router = APIRouter(
+    prefix="/media",
+    tags=["media"],
+    default_response_class=ORJSONResponse,
+    route_class=MediaRoute
+)
 
 # ============================================================================
 # Image Generation Endpoints
@@ -27,22 +66,17 @@ class ImageGenerationRequest(BaseModel):
     provider: Optional[str] = None
 
 @router.post("/images/generate")
-async def generate_image(
-    request: ImageGenerationRequest,
-    generator: ImageGenerator = Depends(lambda: get_image_generator(request.provider))
-):
+async def generate_image(request: ImageGenerationRequest):
     """Generate images from text prompt."""
-    try:
-        images = await generator.generate(
-            prompt=request.prompt,
-            size=request.size,
-            n=request.n,
-            quality=request.quality,
-            style=request.style
-        )
-        return {"images": images}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    generator = get_image_generator(request.provider)
+    images = await generator.generate(
+        prompt=request.prompt,
+        size=request.size,
+        n=request.n,
+        quality=request.quality,
+        style=request.style
+    )
+    return {"images": images}
 
 # ============================================================================
 # Spotify Endpoints
@@ -51,32 +85,24 @@ async def generate_image(
 @router.get("/spotify/authorize")
 async def spotify_authorize():
     """Get Spotify authorization URL."""
-    try:
-        client = get_spotify_client()
-        url = await client.get_authorization_url()
-        return {"authorization_url": url}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    client = get_spotify_client()
+    url = await client.get_authorization_url()
+    return {"authorization_url": url}
 
 @router.post("/spotify/callback")
 async def spotify_callback(code: str):
     """Handle Spotify OAuth callback."""
-    try:
-        client = get_spotify_client()
-        token_data = await client.exchange_code_for_token(code)
-        return {"status": "success", "token_data": token_data}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    client = get_spotify_client()
+    token_data = await client.exchange_code_for_token(code)
+    return {"status": "success", "token_data": token_data}
 
 @router.get("/spotify/playback")
+@cached(policy="short")
 async def get_playback():
     """Get current playback state."""
-    try:
-        client = get_spotify_client()
-        playback = await client.get_current_playback()
-        return {"playback": playback}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    client = get_spotify_client()
+    playback = await client.get_current_playback()
+    return {"playback": playback}
 
 class PlaybackRequest(BaseModel):
     device_id: Optional[str] = None
@@ -86,56 +112,41 @@ class PlaybackRequest(BaseModel):
 @router.post("/spotify/play")
 async def spotify_play(request: PlaybackRequest):
     """Start or resume playback."""
-    try:
-        client = get_spotify_client()
-        await client.play(
-            device_id=request.device_id,
-            context_uri=request.context_uri,
-            uris=request.uris
-        )
-        return {"status": "success"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    client = get_spotify_client()
+    await client.play(
+        device_id=request.device_id,
+        context_uri=request.context_uri,
+        uris=request.uris
+    )
+    return {"status": "success"}
 
 @router.post("/spotify/pause")
 async def spotify_pause(device_id: Optional[str] = None):
     """Pause playback."""
-    try:
-        client = get_spotify_client()
-        await client.pause(device_id=device_id)
-        return {"status": "success"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    client = get_spotify_client()
+    await client.pause(device_id=device_id)
+    return {"status": "success"}
 
 @router.post("/spotify/next")
 async def spotify_next(device_id: Optional[str] = None):
     """Skip to next track."""
-    try:
-        client = get_spotify_client()
-        await client.next_track(device_id=device_id)
-        return {"status": "success"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    client = get_spotify_client()
+    await client.next_track(device_id=device_id)
+    return {"status": "success"}
 
 @router.post("/spotify/previous")
 async def spotify_previous(device_id: Optional[str] = None):
     """Skip to previous track."""
-    try:
-        client = get_spotify_client()
-        await client.previous_track(device_id=device_id)
-        return {"status": "success"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    client = get_spotify_client()
+    await client.previous_track(device_id=device_id)
+    return {"status": "success"}
 
 @router.post("/spotify/volume")
 async def spotify_volume(volume_percent: int, device_id: Optional[str] = None):
     """Set playback volume."""
-    try:
-        client = get_spotify_client()
-        await client.set_volume(volume_percent, device_id=device_id)
-        return {"status": "success"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    client = get_spotify_client()
+    await client.set_volume(volume_percent, device_id=device_id)
+    return {"status": "success"}
 
 class SearchRequest(BaseModel):
     query: str
@@ -145,22 +156,17 @@ class SearchRequest(BaseModel):
 @router.post("/spotify/search")
 async def spotify_search(request: SearchRequest):
     """Search Spotify."""
-    try:
-        client = get_spotify_client()
-        results = await client.search(request.query, request.types, request.limit)
-        return {"results": results}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    client = get_spotify_client()
+    results = await client.search(request.query, request.types, request.limit)
+    return {"results": results}
 
 @router.get("/spotify/devices")
+@cached(policy="short")
 async def get_devices():
     """Get available devices."""
-    try:
-        client = get_spotify_client()
-        devices = await client.get_devices()
-        return {"devices": devices}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    client = get_spotify_client()
+    devices = await client.get_devices()
+    return {"devices": devices}
 
 # ============================================================================
 # Music Creation Endpoints
@@ -175,32 +181,47 @@ class MusicCreationRequest(BaseModel):
     provider: Optional[str] = None
 
 @router.post("/music/create")
-async def create_music(
-    request: MusicCreationRequest,
-    creator: MusicCreator = Depends(lambda: get_music_creator(request.provider))
-):
+async def create_music(request: MusicCreationRequest):
     """Create music from text prompt."""
-    try:
-        result = await creator.create(
-            prompt=request.prompt,
-            title=request.title,
-            tags=request.tags,
-            duration=request.duration,
-            instrumental=request.instrumental
-        )
-        return {"result": result}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    creator = get_music_creator(request.provider)
+    result = await creator.create(
+        prompt=request.prompt,
+        title=request.title,
+        tags=request.tags,
+        duration=request.duration,
+        instrumental=request.instrumental
+    )
+    return {"result": result}
 
 @router.get("/music/status/{track_id}")
 async def get_music_status(track_id: str, provider: Optional[str] = None):
     """Get music creation status."""
-    try:
-        creator = get_music_creator(provider)
-        status = await creator.get_status(track_id)
-        return {"status": status}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    creator = get_music_creator(provider)
+    status = await creator.get_status(track_id)
+    return {"status": status}
+
+@router.get("/music/status/{track_id}/stream")
+async def stream_music_status(track_id: str, provider: Optional[str] = None):
+    """
+    Stream music creation status as Server-Sent Events.
+    
+    Polls the provider server-side and sends an event on each status change,
+    closing after the job finishes, so clients don't poll /music/status.
+    Unchanged polls send a comment line so proxies don't drop the idle stream.
+    """
+    creator = get_music_creator(provider)
+    
+    async def events():
+        try:
+            async for status in creator.watch_status(track_id):
+                if status is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {orjson.dumps(status, default=str).decode()}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {orjson.dumps({'detail': str(e)}).decode()}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 # ============================================================================
 # Sound Effects Endpoints
@@ -215,28 +236,29 @@ async def add_sound_effect(
     description: Optional[str] = None
 ):
     """Add a sound effect to the library."""
+    size = getattr(file, "size", None)
+    if size is not None and size > MAX_SOUND_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"Sound file exceeds {MAX_SOUND_UPLOAD_BYTES} bytes")
+    
+    manager = get_sound_effects_manager()
+    
+    # Stream the spooled upload straight into the library
+    tag_list = [t for t in (tag.strip() for tag in tags.split(",")) if t] if tags else None
     try:
-        import tempfile
-        import os
-        
-        manager = get_sound_effects_manager()
-        
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-        
-        # Add to library
-        tag_list = tags.split(",") if tags else None
-        sound = manager.add_sound(name, tmp_path, category, tag_list, description)
-        
-        # Clean up
-        os.unlink(tmp_path)
-        
-        return {"sound": sound}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        sound = await asyncio.to_thread(
+            manager.add_sound_from_stream,
+            name,
+            file.file,
+            os.path.splitext(file.filename)[1],
+            category,
+            tag_list,
+            description
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    await invalidate_cached(list_sounds, get_sound)
+    return {"sound": sound}
 
 class SoundSearchRequest(BaseModel):
     query: Optional[str] = None
@@ -246,55 +268,45 @@ class SoundSearchRequest(BaseModel):
 @router.post("/sounds/search")
 async def search_sounds(request: SoundSearchRequest):
     """Search sound effects."""
-    try:
-        manager = get_sound_effects_manager()
-        results = manager.search(request.query, request.category, request.tags)
-        return {"results": results}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    manager = get_sound_effects_manager()
+    results = manager.search(request.query, request.category, request.tags)
+    return {"results": results}
 
 @router.get("/sounds/{name}")
+@cached(policy="long")
 async def get_sound(name: str):
     """Get sound effect by name."""
-    try:
-        manager = get_sound_effects_manager()
-        sound = manager.get_sound(name)
-        if not sound:
-            raise HTTPException(status_code=404, detail="Sound not found")
-        return {"sound": sound}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    manager = get_sound_effects_manager()
+    sound = manager.get_sound(name)
+    if not sound:
+        raise HTTPException(status_code=404, detail="Sound not found")
+    return {"sound": sound}
 
 @router.get("/sounds")
-async def list_sounds():
+@cached(policy="long")
+async def list_sounds(response: Response):
     """List all sound effects."""
-    try:
-        manager = get_sound_effects_manager()
-        sounds = manager.list_all()
-        return {"sounds": sounds}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    manager = get_sound_effects_manager()
+    sounds = manager.list_all()
+    return {"sounds": sounds}
 
 @router.delete("/sounds/{name}")
 async def delete_sound(name: str):
     """Delete a sound effect."""
-    try:
-        manager = get_sound_effects_manager()
-        deleted = manager.delete_sound(name)
-        if not deleted:
-            raise HTTPException(status_code=404, detail="Sound not found")
-        return {"status": "deleted"}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    manager = get_sound_effects_manager()
+    deleted = manager.delete_sound(name)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Sound not found")
+    await invalidate_cached(list_sounds, get_sound)
+    return {"status": "deleted"}
 
 # ============================================================================
 # Social Media Endpoints
 # ============================================================================
 
+# Items per batch post; each may fetch and upload media
+SOCIAL_POST_BATCH_MAX = 20
+
 class SocialMediaPostRequest(BaseModel):
     content: str
     media_urls: Optional[List[str]] = None
@@ -302,35 +314,58 @@ class SocialMediaPostRequest(BaseModel):
     page_id: Optional[str] = None
     person_urn: Optional[str] = None
 
+async def _post_social(request: SocialMediaPostRequest) -> Dict[str, Any]:
+    """Post one request through the cached controller for its platform."""
+    controller = get_social_media_controller(request.platform)
+    kwargs = {}
+    if request.page_id:
+        kwargs["page_id"] = request.page_id
+    if request.person_urn:
+        kwargs["person_urn"] = request.person_urn
+    
+    return await controller.post(
+        content=request.content,
+        media_urls=request.media_urls,
+        **kwargs
+    )
+
 @router.post("/social/post")
-async def post_to_social_media(
-    request: SocialMediaPostRequest,
-    controller: SocialMediaController = Depends(lambda: get_social_media_controller(request.platform))
-):
+async def post_to_social_media(request: SocialMediaPostRequest):
     """Post content to social media."""
-    try:
-        kwargs = {}
-        if request.page_id:
-            kwargs["page_id"] = request.page_id
-        if request.person_urn:
-            kwargs["person_urn"] = request.person_urn
-        
-        result = await controller.post(
-            content=request.content,
-            media_urls=request.media_urls,
-            **kwargs
+    result = await _post_social(request)
+    await invalidate_cached(get_social_posts)
+    return {"result": result}
+
+@router.post("/social/post/batch")
+async def post_to_social_media_batch(requests: List[SocialMediaPostRequest]):
+    """
+    Post several items, possibly to different platforms, concurrently.
+    
+    Each item succeeds or fails on its own; results come back in request order.
+    """
+    if len(requests) > SOCIAL_POST_BATCH_MAX:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {SOCIAL_POST_BATCH_MAX} posts per batch"
         )
-        return {"result": result}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    
+    outcomes = await asyncio.gather(*(_post_social(r) for r in requests), return_exceptions=True)
+    results = []
+    for request, outcome in zip(requests, outcomes):
+        if isinstance(outcome, Exception):
+            results.append({"platform": request.platform, "success": False, "error": str(outcome)})
+        else:
+            results.append({"platform": request.platform, "success": True, "result": outcome})
+    
+    if any(r["success"] for r in results):
+        await invalidate_cached(get_social_posts)
+    return {"results": results}
 
 @router.get("/social/posts")
-async def get_social_posts(platform: Optional[str] = None, limit: int = 10):
+@cached(policy="normal")
+async def get_social_posts(response: Response, platform: Optional[str] = None, limit: int = 10):
     """Get recent posts from social media."""
-    try:
-        controller = get_social_media_controller(platform)
-        posts = await controller.get_posts(limit)
-        return {"posts": posts}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    controller = get_social_media_controller(platform)
+    posts = await controller.get_posts(limit)
+    return {"posts": posts}
 
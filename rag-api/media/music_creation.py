@@ -4,9 +4,14 @@ Music Creation
 Integration with music generation services (Suno, MusicLM, etc.)
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
+import asyncio
+import hashlib
 import os
 
+from .http_client import SSL_CONTEXT, json_dumps
+from ..security.rate_limit import get_token_bucket
+
 try:
     import aiohttp
     HAS_AIOHTTP = True
@@ -14,6 +19,18 @@ except ImportError:
     HAS_AIOHTTP = False
 
 
+# Provider request quotas (requests per minute)
+SUNO_GENERATE_PER_MINUTE = 5
+REPLICATE_CREATE_PER_MINUTE = 60
+
+# Job states after which status no longer changes (Suno and Replicate)
+TERMINAL_STATUSES = {"complete", "completed", "succeeded", "failed", "error", "canceled"}
+
+SUNO_GENERATE_URL = "https://api.suno.ai/v1/generate"
+SUNO_TRACKS_URL = "https://api.suno.ai/v1/tracks"
+REPLICATE_PREDICTIONS_URL = "https://api.replicate.com/v1/predictions"
+
+
 class MusicCreator:
     """Music creation using various APIs."""
     
@@ -39,6 +56,39 @@ class MusicCreator:
                 raise ValueError("REPLICATE_API_TOKEN is required for Replicate")
         else:
             raise ValueError(f"Unsupported provider: {provider}")
+        
+        # Built once; every request for this provider reuses the same dict
+        if provider == "replicate":
+            self._headers = {"Authorization": f"Token {self.api_key}", "Content-Type": "application/json"}
+        else:
+            self._headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+        
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._inflight: Dict[str, "asyncio.Task"] = {}  # request hash -> running create
+    
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        """Get this creator's HTTP session, reused across calls for keep-alive."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100, keepalive_timeout=60, ttl_dns_cache=300, ssl=SSL_CONTEXT
+                ),
+                timeout=aiohttp.ClientTimeout(total=30),
+                json_serialize=json_dumps
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
     
     async def create(
         self,
@@ -61,6 +111,27 @@ class MusicCreator:
         Returns:
             Dictionary with track information and URLs
         """
+        # Identical concurrent requests share one upstream (paid) job
+        key = hashlib.sha256(
+            repr((self.provider, prompt, title, tuple(tags or ()), duration, instrumental)).encode()
+        ).hexdigest()
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._create(prompt, title, tags, duration, instrumental))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one caller disconnecting doesn't cancel the job for the others
+        return await asyncio.shield(task)
+    
+    async def _create(
+        self,
+        prompt: str,
+        title: Optional[str],
+        tags: Optional[List[str]],
+        duration: Optional[int],
+        instrumental: bool
+    ) -> Dict[str, Any]:
+        """Dispatch a create request to the configured provider."""
         if self.provider == "suno":
             return await self._create_suno(prompt, title, tags, duration, instrumental)
         elif self.provider == "replicate":
@@ -80,11 +151,7 @@ class MusicCreator:
         if not HAS_AIOHTTP:
             raise ImportError("aiohttp is required. Install with: pip install aiohttp")
         
-        url = "https://api.suno.ai/v1/generate"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        url = SUNO_GENERATE_URL
         
         payload = {
             "prompt": prompt,
@@ -94,24 +161,25 @@ class MusicCreator:
         if title:
             payload["title"] = title
         if tags:
-            payload["tags"] = ",".join(tags)
+            payload["tags"] = ",".join(t.strip() for t in tags if t.strip())
         if duration:
             payload["duration"] = duration
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=payload) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return {
-                        "provider": "suno",
-                        "track_id": data.get("id"),
-                        "status": data.get("status", "pending"),
-                        "audio_url": data.get("audio_url"),
-                        "metadata": data
-                    }
-                else:
-                    error = await response.text()
-                    raise Exception(f"Suno API error: {error}")
+        await get_token_bucket("suno:generate", SUNO_GENERATE_PER_MINUTE).acquire()
+        session = await self._get_session()
+        async with session.post(url, headers=self._headers, json=payload) as response:
+            if response.status == 200:
+                data = await response.json()
+                return {
+                    "provider": "suno",
+                    "track_id": data.get("id"),
+                    "status": data.get("status", "pending"),
+                    "audio_url": data.get("audio_url"),
+                    "metadata": data
+                }
+            else:
+                error = await response.text()
+                raise Exception(f"Suno API error: {error}")
     
     async def _create_replicate(
         self,
@@ -125,11 +193,7 @@ class MusicCreator:
         # Example using MusicLM model on Replicate
         model = "meta/musicgen:671ac645ce5e552cc63a54c2ddb09c0fd96606ad"
         
-        url = "https://api.replicate.com/v1/predictions"
-        headers = {
-            "Authorization": f"Token {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        url = REPLICATE_PREDICTIONS_URL
         
         payload = {
             "version": model.split(":")[1] if ":" in model else model,
@@ -139,20 +203,21 @@ class MusicCreator:
             }
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=payload) as response:
-                if response.status == 201:
-                    prediction = await response.json()
-                    return {
-                        "provider": "replicate",
-                        "prediction_id": prediction.get("id"),
-                        "status": prediction.get("status", "starting"),
-                        "urls": prediction.get("urls", {}),
-                        "metadata": prediction
-                    }
-                else:
-                    error = await response.text()
-                    raise Exception(f"Replicate API error: {error}")
+        await get_token_bucket("replicate:predictions", REPLICATE_CREATE_PER_MINUTE).acquire()
+        session = await self._get_session()
+        async with session.post(url, headers=self._headers, json=payload) as response:
+            if response.status == 201:
+                prediction = await response.json()
+                return {
+                    "provider": "replicate",
+                    "prediction_id": prediction.get("id"),
+                    "status": prediction.get("status", "starting"),
+                    "urls": prediction.get("urls", {}),
+                    "metadata": prediction
+                }
+            else:
+                error = await response.text()
+                raise Exception(f"Replicate API error: {error}")
     
     async def get_status(self, track_id: str) -> Dict[str, Any]:
         """
@@ -171,50 +236,85 @@ class MusicCreator:
         else:
             raise ValueError(f"Unsupported provider: {self.provider}")
     
+    async def watch_status(
+        self,
+        track_id: str,
+        interval: float = 2.0,
+        timeout: float = 600.0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Poll job status server-side and yield it whenever it changes.
+        
+        Args:
+            track_id: Track or job ID
+            interval: Seconds between upstream polls
+            timeout: Give up after this many seconds
+        
+        Yields:
+            Status information, ending with a terminal status; None after a
+            poll that found no change, so callers can keep a stream alive
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        last = None
+        while True:
+            status = await self.get_status(track_id)
+            if status != last:
+                yield status
+                last = status
+            else:
+                yield None
+            if status.get("status") in TERMINAL_STATUSES:
+                return
+            if loop.time() >= deadline:
+                raise TimeoutError(f"Music job {track_id} did not finish within {timeout:.0f}s")
+            await asyncio.sleep(interval)
+    
     async def _get_suno_status(self, track_id: str) -> Dict[str, Any]:
         """Get Suno track status."""
         if not HAS_AIOHTTP:
             raise ImportError("aiohttp is required")
         
-        url = f"https://api.suno.ai/v1/tracks/{track_id}"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}"
-        }
+        url = f"{SUNO_TRACKS_URL}/{track_id}"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    error = await response.text()
-                    raise Exception(f"Suno API error: {error}")
+        session = await self._get_session()
+        async with session.get(url, headers=self._headers) as response:
+            if response.status == 200:
+                return await response.json()
+            else:
+                error = await response.text()
+                raise Exception(f"Suno API error: {error}")
     
     async def _get_replicate_status(self, prediction_id: str) -> Dict[str, Any]:
         """Get Replicate prediction status."""
         if not HAS_AIOHTTP:
             raise ImportError("aiohttp is required")
         
-        url = f"https://api.replicate.com/v1/predictions/{prediction_id}"
-        headers = {
-            "Authorization": f"Token {self.api_key}"
-        }
+        url = f"{REPLICATE_PREDICTIONS_URL}/{prediction_id}"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    error = await response.text()
-                    raise Exception(f"Replicate API error: {error}")
+        session = await self._get_session()
+        async with session.get(url, headers=self._headers) as response:
+            if response.status == 200:
+                return await response.json()
+            else:
+                error = await response.text()
+                raise Exception(f"Replicate API error: {error}")
 
 
-# Global instance
-_music_creator: Optional[MusicCreator] = None
+# Global instances (one per provider)
+_music_creators: Dict[str, MusicCreator] = {}
 
 def get_music_creator(provider: Optional[str] = None) -> MusicCreator:
     """Get music creator instance."""
-    global _music_creator
-    if _music_creator is None or (provider and _music_creator.provider != provider):
-        _music_creator = MusicCreator(provider=provider or os.getenv("MUSIC_CREATION_PROVIDER", "suno"))
-    return _music_creator
+    provider = provider or os.getenv("MUSIC_CREATION_PROVIDER", "suno")
+    
+    if provider not in _music_creators:
+        _music_creators[provider] = MusicCreator(provider=provider)
+    
+    return _music_creators[provider]
+
 
+async def close_music_creator():
+    """Close HTTP sessions of all cached music creators (call on shutdown)."""
+    for creator in _music_creators.values():
+        await creator.close()
@@ -5,7 +5,16 @@ Automation for Twitter/X, Facebook, Instagram, LinkedIn, etc.
 """
 
 from typing import Optional, Dict, Any, List
+from urllib.parse import urlparse
+import asyncio
+import ipaddress
 import os
+import random
+import socket
+
+from .http_client import SSL_CONTEXT, json_dumps
+from ..monitoring.logger import get_logger
+from ..security.rate_limit import get_token_bucket
 
 try:
     import aiohttp
@@ -13,6 +22,58 @@ try:
 except ImportError:
     HAS_AIOHTTP = False
 
+logger = get_logger(__name__)
+
+
+# X API v2 allows 100 tweet creates per 15 minutes per user
+TWITTER_POST_PER_MINUTE = 100 / 15
+TWITTER_POST_BURST = 10
+
+# The simple (non-chunked) media upload endpoint takes images up to 5 MB,
+# and a tweet carries at most 4 attachments
+TWITTER_MEDIA_MAX_BYTES = 5 * 1024 * 1024
+TWITTER_MAX_MEDIA = 4
+MEDIA_FETCH_CHUNK_SIZE = 64 * 1024
+
+TWITTER_TWEETS_URL = "https://api.twitter.com/2/tweets"
+TWITTER_MEDIA_UPLOAD_URL = "https://upload.twitter.com/1.1/media/upload.json"
+LINKEDIN_UGC_POSTS_URL = "https://api.linkedin.com/v2/ugcPosts"
+LINKEDIN_MEDIA_TEMPLATE = {"status": "READY"}
+INSTAGRAM_GRAPH_URL = "https://graph.instagram.com/v18.0"
+
+# Instagram media containers are processed asynchronously; wait between
+# status checks (plus up to 25% jitter) before publishing
+INSTAGRAM_CONTAINER_POLL_DELAYS = (0.5, 1, 2, 4, 8)
+
+
+async def _check_public_url(url: str):
+    """
+    Reject media URLs the server must not fetch on a client's behalf.
+    
+    Only http(s) URLs whose host resolves solely to public addresses are
+    allowed, so a post cannot make the server read internal services.
+    
+    Args:
+        url: Client-supplied media URL
+    
+    Raises:
+        ValueError: If the URL is not a public http(s) URL
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise ValueError(f"Media URL must be http(s): {url}")
+    
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            parsed.hostname, parsed.port, type=socket.SOCK_STREAM
+        )
+    except socket.gaierror:
+        raise ValueError(f"Media URL host does not resolve: {url}")
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%", 1)[0])
+        if not address.is_global:
+            raise ValueError(f"Media URL must point to a public host: {url}")
+
 
 class SocialMediaController:
     """Controls social media platforms."""
@@ -49,6 +110,30 @@ class SocialMediaController:
                 raise ValueError("LinkedIn API credentials are required")
         else:
             raise ValueError(f"Unsupported platform: {platform}")
+        
+        # Built once; every request for this platform reuses the same dict
+        # (Facebook/Instagram pass the token as a query parameter instead)
+        self._auth_headers = {"Authorization": f"Bearer {self.access_token}"}
+        self._headers = {**self._auth_headers, "Content-Type": "application/json"}
+        if platform == "linkedin":
+            self._headers["X-Restli-Protocol-Version"] = "2.0.0"
+        
+        self._session: Optional["aiohttp.ClientSession"] = None
+    
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        """Get this platform's HTTP session, reused across calls for keep-alive."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=32, keepalive_timeout=75, ssl=SSL_CONTEXT),
+                json_serialize=json_dumps
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     async def post(self, content: str, media_urls: Optional[List[str]] = None, **kwargs) -> Dict[str, Any]:
         """
@@ -79,30 +164,66 @@ class SocialMediaController:
             raise ImportError("aiohttp is required. Install with: pip install aiohttp")
         
         # Twitter API v2
-        url = "https://api.twitter.com/2/tweets"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {"text": content}
         
-        # Add media if provided
+        session = await self._get_session()
+        
+        # Add media if provided (uploads run concurrently)
         if media_urls:
-            # Upload media first (simplified - in production use proper media upload)
-            media_ids = []
-            for media_url in media_urls:
-                # This is simplified - actual implementation needs media upload endpoint
-                media_ids.append(media_url)
-            payload["media"] = {"media_ids": media_ids}
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=payload) as response:
-                if response.status == 201:
-                    return await response.json()
-                else:
-                    error = await response.text()
-                    raise Exception(f"Twitter API error: {error}")
+            if len(media_urls) > TWITTER_MAX_MEDIA:
+                raise ValueError(f"Twitter allows at most {TWITTER_MAX_MEDIA} media per post")
+            media_ids = await asyncio.gather(
+                *(self._upload_twitter_media(session, media_url) for media_url in media_urls)
+            )
+            payload["media"] = {"media_ids": list(media_ids)}
+        
+        await get_token_bucket("twitter:tweets", TWITTER_POST_PER_MINUTE, TWITTER_POST_BURST).acquire()
+        async with session.post(TWITTER_TWEETS_URL, headers=self._headers, json=payload) as response:
+            if response.status == 201:
+                return await response.json()
+            else:
+                error = await response.text()
+                raise Exception(f"Twitter API error: {error}")
+    
+    async def _upload_twitter_media(self, session, media_url: str) -> str:
+        """
+        Fetch a media file and upload it to Twitter.
+        
+        Args:
+            session: aiohttp client session
+            media_url: Public URL of the image/video
+        
+        Returns:
+            Twitter media ID string
+        """
+        await _check_public_url(media_url)
+        
+        # Redirects are not followed: the target would skip the host check
+        async with session.get(media_url, allow_redirects=False) as response:
+            if response.status != 200:
+                raise Exception(f"Failed to fetch media {media_url}: HTTP {response.status}")
+            if (response.content_length or 0) > TWITTER_MEDIA_MAX_BYTES:
+                raise ValueError(f"Media exceeds {TWITTER_MEDIA_MAX_BYTES} bytes: {media_url}")
+            
+            # Content-Length may be missing or wrong, so count while reading
+            chunks = []
+            size = 0
+            async for chunk in response.content.iter_chunked(MEDIA_FETCH_CHUNK_SIZE):
+                size += len(chunk)
+                if size > TWITTER_MEDIA_MAX_BYTES:
+                    raise ValueError(f"Media exceeds {TWITTER_MEDIA_MAX_BYTES} bytes: {media_url}")
+                chunks.append(chunk)
+            media_bytes = b"".join(chunks)
+        
+        form = aiohttp.FormData()
+        form.add_field("media", media_bytes)
+        # Multipart sets its own Content-Type
+        async with session.post(TWITTER_MEDIA_UPLOAD_URL, headers=self._auth_headers, data=form) as response:
+            if response.status in (200, 201):
+                data = await response.json()
+                return data["media_id_string"]
+            error = await response.text()
+            raise Exception(f"Twitter media upload error: {error}")
     
     async def _post_facebook(self, content: str, media_urls: Optional[List[str]], **kwargs) -> Dict[str, Any]:
         """Post to Facebook."""
@@ -122,13 +243,13 @@ class SocialMediaController:
         if media_urls:
             params["link"] = media_urls[0]
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, params=params) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    error = await response.text()
-                    raise Exception(f"Facebook API error: {error}")
+        session = await self._get_session()
+        async with session.post(url, params=params) as response:
+            if response.status == 200:
+                return await response.json()
+            else:
+                error = await response.text()
+                raise Exception(f"Facebook API error: {error}")
     
     async def _post_instagram(self, content: str, media_urls: Optional[List[str]], **kwargs) -> Dict[str, Any]:
         """Post to Instagram."""
@@ -139,34 +260,69 @@ class SocialMediaController:
         if not media_urls:
             raise ValueError("Instagram posts require media")
         
-        # Simplified - actual implementation needs proper Instagram Graph API flow
-        url = "https://graph.instagram.com/v18.0/me/media"
+        url = f"{INSTAGRAM_GRAPH_URL}/me/media"
         params = {
             "image_url": media_urls[0],
             "caption": content,
             "access_token": self.access_token
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, params=params) as response:
-                if response.status == 200:
-                    creation_data = await response.json()
-                    # Then publish
-                    media_id = creation_data.get("id")
-                    publish_url = f"https://graph.instagram.com/v18.0/me/media_publish"
-                    publish_params = {
-                        "creation_id": media_id,
-                        "access_token": self.access_token
-                    }
-                    async with session.post(publish_url, params=publish_params) as publish_response:
-                        if publish_response.status == 200:
-                            return await publish_response.json()
-                        else:
-                            error = await publish_response.text()
-                            raise Exception(f"Instagram publish error: {error}")
-                else:
+        session = await self._get_session()
+        async with session.post(url, params=params) as response:
+            if response.status != 200:
+                error = await response.text()
+                raise Exception(f"Instagram API error: {error}")
+            creation_data = await response.json()
+        
+        # Then publish once the container has finished processing
+        media_id = creation_data.get("id")
+        attempts = await self._wait_for_instagram_container(session, media_id)
+        publish_url = f"{INSTAGRAM_GRAPH_URL}/me/media_publish"
+        publish_params = {
+            "creation_id": media_id,
+            "access_token": self.access_token
+        }
+        async with session.post(publish_url, params=publish_params) as publish_response:
+            if publish_response.status == 200:
+                logger.info(
+                    "Instagram container %s ready after %d status checks", media_id, attempts
+                )
+                return await publish_response.json()
+            else:
+                error = await publish_response.text()
+                raise Exception(f"Instagram publish error: {error}")
+    
+    async def _wait_for_instagram_container(self, session, media_id: str) -> int:
+        """
+        Poll an Instagram media container until it is ready to publish.
+        
+        Args:
+            session: aiohttp client session
+            media_id: Container ID from the create call
+        
+        Returns:
+            Number of status checks made
+        """
+        url = f"{INSTAGRAM_GRAPH_URL}/{media_id}"
+        params = {"fields": "status_code", "access_token": self.access_token}
+        
+        checks = len(INSTAGRAM_CONTAINER_POLL_DELAYS) + 1
+        for attempt in range(1, checks + 1):
+            async with session.get(url, params=params) as response:
+                if response.status != 200:
                     error = await response.text()
-                    raise Exception(f"Instagram API error: {error}")
+                    raise Exception(f"Instagram container status error: {error}")
+                status = (await response.json()).get("status_code")
+            
+            if status == "FINISHED":
+                return attempt
+            if status in ("ERROR", "EXPIRED"):
+                raise Exception(f"Instagram media container {media_id} {status.lower()}")
+            if attempt < checks:
+                delay = INSTAGRAM_CONTAINER_POLL_DELAYS[attempt - 1]
+                await asyncio.sleep(delay * (1 + random.random() / 4))
+        
+        raise Exception(f"Instagram media container {media_id} not ready after {checks} checks")
     
     async def _post_linkedin(self, content: str, media_urls: Optional[List[str]], **kwargs) -> Dict[str, Any]:
         """Post to LinkedIn."""
@@ -177,13 +333,6 @@ class SocialMediaController:
         if not person_urn:
             raise ValueError("LinkedIn person URN is required")
         
-        url = "https://api.linkedin.com/v2/ugcPosts"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json",
-            "X-Restli-Protocol-Version": "2.0.0"
-        }
-        
         # Build share content
         share_content = {
             "shareCommentary": {
@@ -194,7 +343,7 @@ class SocialMediaController:
         
         if media_urls:
             share_content["shareMediaCategory"] = "ARTICLE"
-            share_content["media"] = [{"status": "READY", "originalUrl": url} for url in media_urls]
+            share_content["media"] = [{**LINKEDIN_MEDIA_TEMPLATE, "originalUrl": u} for u in media_urls]
         
         payload = {
             "author": f"urn:li:person:{person_urn}",
@@ -207,13 +356,13 @@ class SocialMediaController:
             }
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=payload) as response:
-                if response.status == 201:
-                    return await response.json()
-                else:
-                    error = await response.text()
-                    raise Exception(f"LinkedIn API error: {error}")
+        session = await self._get_session()
+        async with session.post(LINKEDIN_UGC_POSTS_URL, headers=self._headers, json=payload) as response:
+            if response.status == 201:
+                return await response.json()
+            else:
+                error = await response.text()
+                raise Exception(f"LinkedIn API error: {error}")
     
     async def get_posts(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent posts."""
@@ -231,21 +380,18 @@ class SocialMediaController:
         
         user_id = os.getenv("TWITTER_USER_ID")
         url = f"https://api.twitter.com/2/users/{user_id}/tweets"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}"
-        }
         params = {
             "max_results": limit
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get("data", [])
-                else:
-                    error = await response.text()
-                    raise Exception(f"Twitter API error: {error}")
+        session = await self._get_session()
+        async with session.get(url, headers=self._headers, params=params) as response:
+            if response.status == 200:
+                data = await response.json()
+                return data.get("data", [])
+            else:
+                error = await response.text()
+                raise Exception(f"Twitter API error: {error}")
     
     async def _get_facebook_posts(self, limit: int) -> List[Dict[str, Any]]:
         """Get Facebook posts."""
@@ -259,14 +405,14 @@ class SocialMediaController:
             "limit": limit
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get("data", [])
-                else:
-                    error = await response.text()
-                    raise Exception(f"Facebook API error: {error}")
+        session = await self._get_session()
+        async with session.get(url, params=params) as response:
+            if response.status == 200:
+                data = await response.json()
+                return data.get("data", [])
+            else:
+                error = await response.text()
+                raise Exception(f"Facebook API error: {error}")
 
 
 # Global instances
@@ -281,3 +427,8 @@ def get_social_media_controller(platform: Optional[str] = None) -> SocialMediaCo
     
     return _social_media_controllers[platform]
 
+
+async def close_social_media_controllers():
+    """Close HTTP sessions of all cached controllers (call on shutdown)."""
+    for controller in _social_media_controllers.values():
+        await controller.close()
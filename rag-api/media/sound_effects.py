@@ -4,10 +4,52 @@ Sound Effects Manager
 Manages sound effects library and playback.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, BinaryIO, Set
+import atexit
 import os
+import shutil
+import threading
+import time
 from pathlib import Path
-import json
+
+import orjson
+
+try:
+    import mutagen
+    HAS_MUTAGEN = True
+except ImportError:
+    HAS_MUTAGEN = False
+
+try:
+    import soundfile
+    HAS_SOUNDFILE = True
+except ImportError:
+    HAS_SOUNDFILE = False
+
+
+# Uploads are copied to the library in 1 MiB chunks
+UPLOAD_CHUNK_SIZE = 1 << 20
+MAX_SOUND_UPLOAD_BYTES = int(os.getenv("MAX_SOUND_UPLOAD_BYTES", str(50 * 1024 * 1024)))
+
+# Formats libsndfile reads from the header alone (no tag parsing)
+SOUNDFILE_SUFFIXES = {".wav", ".flac", ".ogg", ".aif", ".aiff"}
+
+# Index writes are coalesced: at most one write per interval
+INDEX_FLUSH_INTERVAL = 1.0
+
+
+def _trigrams(text: str) -> Set[str]:
+    """All 3-character substrings of text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _discard(index: Dict[str, Set[str]], key: str, name: str):
+    """Remove name from index[key], dropping the key once its set is empty."""
+    names = index.get(key)
+    if names is not None:
+        names.discard(name)
+        if not names:
+            del index[key]
 
 
 class SoundEffectsManager:
@@ -26,21 +68,72 @@ class SoundEffectsManager:
         # Load library index
         self.index_file = self.library_path / "index.json"
         self.index = self._load_index()
+        
+        # In-memory search indexes, kept in sync by add/delete
+        self._by_category: Dict[str, Set[str]] = {}
+        self._by_tag: Dict[str, Set[str]] = {}
+        self._categories: Set[str] = set(self.index["categories"])
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._search_text: Dict[str, str] = {}  # name -> lowercased "name\0description"
+        self._paths: Dict[str, Path] = {}  # name -> library file path
+        self._order: Dict[str, int] = {}  # name -> insertion position, matches index order
+        self._next_order = 0
+        for name, sound in self.index["sounds"].items():
+            self._index_sound(name, sound)
+        
+        # Debounced persistence of the index file
+        self._dirty = False
+        self._last_flush = 0.0
+        self._flush_timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()  # guards index, search indexes and writes
+        atexit.register(self.flush)
     
     def _load_index(self) -> Dict[str, Any]:
         """Load sound effects index."""
         if self.index_file.exists():
             try:
-                with open(self.index_file, "r") as f:
-                    return json.load(f)
+                with open(self.index_file, "rb") as f:
+                    data = f.read()
+                return orjson.loads(data)
             except Exception:
                 return {"sounds": {}, "categories": []}
         return {"sounds": {}, "categories": []}
     
     def _save_index(self):
-        """Save sound effects index."""
-        with open(self.index_file, "w") as f:
-            json.dump(self.index, f, indent=2)
+        """
+        Mark the index as changed and schedule a write.
+        
+        Writes immediately if the last one was more than
+        INDEX_FLUSH_INTERVAL ago; otherwise a timer writes once the
+        interval has passed, so bursts of changes cost a single write.
+        """
+        with self._lock:
+            self._dirty = True
+            wait = self._last_flush + INDEX_FLUSH_INTERVAL - time.monotonic()
+            if wait > 0:
+                if self._flush_timer is None:
+                    self._flush_timer = threading.Timer(wait, self.flush)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+                return
+        self.flush()
+    
+    def flush(self):
+        """Write the index to disk now if it has unsaved changes."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return
+            # Write to a temp file and swap it in so readers never see a partial index
+            tmp_file = self.index_file.with_name(self.index_file.name + ".tmp")
+            data = orjson.dumps(self.index)
+            with open(tmp_file, "wb") as f:
+                f.write(data)
+            os.replace(tmp_file, self.index_file)
+            self._dirty = False
+            self._last_flush = time.monotonic()
     
     def add_sound(
         self,
@@ -69,9 +162,65 @@ class SoundEffectsManager:
         
         # Copy to library
         library_file = self.library_path / f"{name}{sound_path.suffix}"
-        import shutil
-        shutil.copy2(sound_path, library_file)
+        shutil.copy2(sound_path, library_file)  # sendfile/fcopyfile fast path on Linux/macOS
+        
+        return self._register_sound(name, library_file, category, tags, description)
+    
+    def add_sound_from_stream(
+        self,
+        name: str,
+        source: BinaryIO,
+        suffix: str,
+        category: str = "general",
+        tags: Optional[List[str]] = None,
+        description: Optional[str] = None,
+        max_bytes: int = MAX_SOUND_UPLOAD_BYTES
+    ) -> Dict[str, Any]:
+        """
+        Add a sound effect by copying a file object straight into the library.
+        
+        The data is copied in chunks (constant memory, one pass) to a partial
+        file that is renamed into place once complete.
+        
+        Args:
+            name: Sound name/ID
+            source: Readable binary file object (e.g. an upload's spooled file)
+            suffix: File extension including the dot (e.g. ".wav")
+            category: Category name
+            tags: Optional tags
+            description: Optional description
+            max_bytes: Maximum accepted size
+        
+        Returns:
+            Sound metadata
+        """
+        library_file = self.library_path / f"{name}{suffix}"
+        partial_file = library_file.with_name(library_file.name + ".part")
         
+        written = 0
+        try:
+            with open(partial_file, "wb") as out:
+                while chunk := source.read(UPLOAD_CHUNK_SIZE):
+                    written += len(chunk)
+                    if written > max_bytes:
+                        raise ValueError(f"Sound file exceeds {max_bytes} bytes")
+                    out.write(chunk)
+            os.replace(partial_file, library_file)
+        except BaseException:
+            partial_file.unlink(missing_ok=True)
+            raise
+        
+        return self._register_sound(name, library_file, category, tags, description)
+    
+    def _register_sound(
+        self,
+        name: str,
+        library_file: Path,
+        category: str,
+        tags: Optional[List[str]],
+        description: Optional[str]
+    ) -> Dict[str, Any]:
+        """Index a sound file that is already in the library."""
         # Add to index
         sound_data = {
             "name": name,
@@ -82,27 +231,60 @@ class SoundEffectsManager:
             "duration": self._get_duration(library_file)
         }
         
-        self.index["sounds"][name] = sound_data
-        
-        # Update categories
-        if category not in self.index["categories"]:
-            self.index["categories"].append(category)
-        
-        self._save_index()
+        with self._lock:
+            self._unindex_sound(name)
+            self.index["sounds"][name] = sound_data
+            self._index_sound(name, sound_data)
+            
+            # Update categories
+            if category not in self._categories:
+                self._categories.add(category)
+                self.index["categories"].append(category)
+            
+            self._save_index()
         
         return sound_data
     
+    def _index_sound(self, name: str, sound: Dict[str, Any]):
+        """Add a sound to the search indexes."""
+        self._by_category.setdefault(sound["category"], set()).add(name)
+        for tag in sound.get("tags", []):
+            self._by_tag.setdefault(tag, set()).add(name)
+        self._paths[name] = self.library_path / sound["file"]
+        text = f"{name.lower()}\0{(sound.get('description') or '').lower()}"
+        self._search_text[name] = text
+        for gram in _trigrams(text):
+            self._trigrams.setdefault(gram, set()).add(name)
+        if name not in self._order:
+            self._order[name] = self._next_order
+            self._next_order += 1
+    
+    def _unindex_sound(self, name: str):
+        """Remove a sound from the search indexes."""
+        sound = self.index["sounds"].get(name)
+        if sound is None:
+            return
+        _discard(self._by_category, sound["category"], name)
+        for tag in sound.get("tags", []):
+            _discard(self._by_tag, tag, name)
+        self._paths.pop(name, None)
+        for gram in _trigrams(self._search_text.pop(name, "")):
+            _discard(self._trigrams, gram, name)
+    
     def _get_duration(self, file_path: Path) -> Optional[float]:
         """Get audio file duration."""
-        try:
-            import mutagen
-            audio_file = mutagen.File(str(file_path))
-            if audio_file:
-                return audio_file.info.length if hasattr(audio_file.info, "length") else None
-        except ImportError:
-            pass
-        except Exception:
-            pass
+        if HAS_SOUNDFILE and file_path.suffix.lower() in SOUNDFILE_SUFFIXES:
+            try:
+                return soundfile.info(str(file_path)).duration
+            except Exception:
+                pass
+        if HAS_MUTAGEN:
+            try:
+                audio_file = mutagen.File(str(file_path))
+                if audio_file:
+                    return audio_file.info.length if hasattr(audio_file.info, "length") else None
+            except Exception:
+                pass
         return None
     
     def search(
@@ -122,28 +304,33 @@ class SoundEffectsManager:
         Returns:
             List of matching sounds
         """
-        results = []
-        
-        for name, sound in self.index["sounds"].items():
+        with self._lock:
+            sounds = self.index["sounds"]
+            candidates: Optional[Set[str]] = None
+            
             # Category filter
-            if category and sound["category"] != category:
-                continue
+            if category:
+                candidates = set(self._by_category.get(category, ()))
             
-            # Tags filter
+            # Tags filter (any tag matches)
             if tags:
-                if not any(tag in sound.get("tags", []) for tag in tags):
-                    continue
+                tagged = set().union(*(self._by_tag.get(tag, ()) for tag in tags))
+                candidates = tagged if candidates is None else candidates & tagged
             
-            # Query filter
+            # Query filter: narrow by trigrams, then confirm the substring match
             if query:
                 query_lower = query.lower()
-                if (query_lower not in name.lower() and
-                    query_lower not in sound.get("description", "").lower()):
-                    continue
+                grams = _trigrams(query_lower)
+                if grams:
+                    matching = set.intersection(*(self._trigrams.get(g, set()) for g in grams))
+                    candidates = matching if candidates is None else candidates & matching
+                elif candidates is None:
+                    candidates = set(sounds)
+                candidates = {n for n in candidates if query_lower in self._search_text[n]}
             
-            results.append(sound)
-        
-        return results
+            if candidates is None:
+                return list(sounds.values())
+            return [sounds[n] for n in sorted(candidates, key=self._order.__getitem__)]
     
     def get_sound(self, name: str) -> Optional[Dict[str, Any]]:
         """Get sound by name."""
@@ -151,10 +338,7 @@ class SoundEffectsManager:
     
     def get_sound_path(self, name: str) -> Optional[Path]:
         """Get file path for sound."""
-        sound = self.get_sound(name)
-        if sound:
-            return self.library_path / sound["file"]
-        return None
+        return self._paths.get(name)
     
     def list_categories(self) -> List[str]:
         """List all categories."""
@@ -185,8 +369,11 @@ class SoundEffectsManager:
             file_path.unlink()
         
         # Remove from index
-        del self.index["sounds"][name]
-        self._save_index()
+        with self._lock:
+            self._unindex_sound(name)
+            self._order.pop(name, None)
+            del self.index["sounds"][name]
+            self._save_index()
         
         return True
 
@@ -201,3 +388,8 @@ def get_sound_effects_manager() -> SoundEffectsManager:
         _sound_effects_manager = SoundEffectsManager()
     return _sound_effects_manager
 
+
+def close_sound_effects_manager():
+    """Write any pending index changes (call on shutdown)."""
+    if _sound_effects_manager is not None:
+        _sound_effects_manager.flush()
@@ -5,10 +5,16 @@ Control Spotify playback, search, and manage playlists.
 """
 
 from typing import Optional, List, Dict, Any
+import asyncio
 import os
 import base64
 import hashlib
 import secrets
+import time
+from urllib.parse import quote, urlencode
+
+from .http_client import SSL_CONTEXT
+from ..security.rate_limit import get_token_bucket
 
 try:
     import aiohttp
@@ -17,6 +23,28 @@ except ImportError:
     HAS_AIOHTTP = False
 
 
+# Spotify's limit is over a rolling 30s window, so keep bursts small
+SPOTIFY_API_PER_MINUTE = 180
+SPOTIFY_API_BURST = 30
+
+# Refresh access tokens this many seconds before they expire
+TOKEN_EXPIRY_MARGIN = 60
+
+SPOTIFY_AUTHORIZE_URL = "https://accounts.spotify.com/authorize"
+SPOTIFY_TOKEN_URL = "https://accounts.spotify.com/api/token"
+
+SPOTIFY_SCOPES = " ".join([
+    "user-read-playback-state",
+    "user-modify-playback-state",
+    "user-read-currently-playing",
+    "playlist-read-private",
+    "playlist-modify-public",
+    "playlist-modify-private",
+    "user-library-read",
+    "user-library-modify"
+])
+
+
 class SpotifyClient:
     """Spotify API client for music control."""
     
@@ -32,6 +60,31 @@ class SpotifyClient:
         self.access_token: Optional[str] = None
         self.refresh_token: Optional[str] = None
         self.token_expires_at: Optional[float] = None
+        self._refresh_lock = asyncio.Lock()  # One refresh at a time
+        
+        # Client credentials never change, so encode the Basic auth header once
+        auth_b64 = base64.b64encode(f"{self.client_id}:{self.client_secret}".encode("ascii")).decode("ascii")
+        self._token_headers = {
+            "Authorization": f"Basic {auth_b64}",
+            "Content-Type": "application/x-www-form-urlencoded"
+        }
+        self._session: Optional["aiohttp.ClientSession"] = None
+    
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        """Get the client's HTTP session, reused across calls for keep-alive."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=20, keepalive_timeout=60, ttl_dns_cache=300, ssl=SSL_CONTEXT
+                )
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     async def get_authorization_url(self, state: Optional[str] = None) -> str:
         """
@@ -46,27 +99,15 @@ class SpotifyClient:
         if not state:
             state = secrets.token_urlsafe(32)
         
-        scopes = [
-            "user-read-playback-state",
-            "user-modify-playback-state",
-            "user-read-currently-playing",
-            "playlist-read-private",
-            "playlist-modify-public",
-            "playlist-modify-private",
-            "user-library-read",
-            "user-library-modify"
-        ]
-        
         params = {
             "client_id": self.client_id,
             "response_type": "code",
             "redirect_uri": self.redirect_uri,
-            "scope": " ".join(scopes),
+            "scope": SPOTIFY_SCOPES,
             "state": state
         }
         
-        query_string = "&".join([f"{k}={v}" for k, v in params.items()])
-        return f"https://accounts.spotify.com/authorize?{query_string}"
+        return f"{SPOTIFY_AUTHORIZE_URL}?{urlencode(params, quote_via=quote)}"
     
     async def exchange_code_for_token(self, code: str) -> Dict[str, Any]:
         """
@@ -81,41 +122,43 @@ class SpotifyClient:
         if not HAS_AIOHTTP:
             raise ImportError("aiohttp is required. Install with: pip install aiohttp")
         
-        url = "https://accounts.spotify.com/api/token"
-        
-        auth_string = f"{self.client_id}:{self.client_secret}"
-        auth_bytes = auth_string.encode("ascii")
-        auth_b64 = base64.b64encode(auth_bytes).decode("ascii")
-        
-        headers = {
-            "Authorization": f"Basic {auth_b64}",
-            "Content-Type": "application/x-www-form-urlencoded"
-        }
-        
         data = {
             "grant_type": "authorization_code",
             "code": code,
             "redirect_uri": self.redirect_uri
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, data=data) as response:
-                if response.status == 200:
-                    token_data = await response.json()
-                    self.access_token = token_data["access_token"]
-                    self.refresh_token = token_data.get("refresh_token")
-                    expires_in = token_data.get("expires_in", 3600)
-                    import time
-                    self.token_expires_at = time.time() + expires_in
-                    return token_data
-                else:
-                    error = await response.text()
-                    raise Exception(f"Failed to exchange token: {error}")
+        session = await self._get_session()
+        async with session.post(SPOTIFY_TOKEN_URL, headers=self._token_headers, data=data) as response:
+            if response.status == 200:
+                token_data = await response.json()
+                self.access_token = token_data["access_token"]
+                self.refresh_token = token_data.get("refresh_token")
+                expires_in = token_data.get("expires_in", 3600)
+                self.token_expires_at = time.time() + expires_in
+                return token_data
+            else:
+                error = await response.text()
+                raise Exception(f"Failed to exchange token: {error}")
+    
+    def _token_is_fresh(self) -> bool:
+        """Whether the cached access token is usable for at least TOKEN_EXPIRY_MARGIN."""
+        if not self.access_token:
+            return False
+        if self.token_expires_at is None:
+            return True
+        return time.time() < self.token_expires_at - TOKEN_EXPIRY_MARGIN
     
     async def _ensure_token(self):
         """Ensure access token is valid."""
-        import time
-        if not self.access_token or (self.token_expires_at and time.time() >= self.token_expires_at):
+        if self._token_is_fresh():
+            return
+        
+        # Concurrent callers wait for a single refresh instead of each
+        # hitting the token endpoint
+        async with self._refresh_lock:
+            if self._token_is_fresh():
+                return
             if self.refresh_token:
                 await self._refresh_token()
             else:
@@ -129,33 +172,21 @@ class SpotifyClient:
         if not self.refresh_token:
             raise Exception("No refresh token available")
         
-        url = "https://accounts.spotify.com/api/token"
-        
-        auth_string = f"{self.client_id}:{self.client_secret}"
-        auth_bytes = auth_string.encode("ascii")
-        auth_b64 = base64.b64encode(auth_bytes).decode("ascii")
-        
-        headers = {
-            "Authorization": f"Basic {auth_b64}",
-            "Content-Type": "application/x-www-form-urlencoded"
-        }
-        
         data = {
             "grant_type": "refresh_token",
             "refresh_token": self.refresh_token
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, data=data) as response:
-                if response.status == 200:
-                    token_data = await response.json()
-                    self.access_token = token_data["access_token"]
-                    expires_in = token_data.get("expires_in", 3600)
-                    import time
-                    self.token_expires_at = time.time() + expires_in
-                else:
-                    error = await response.text()
-                    raise Exception(f"Failed to refresh token: {error}")
+        session = await self._get_session()
+        async with session.post(SPOTIFY_TOKEN_URL, headers=self._token_headers, data=data) as response:
+            if response.status == 200:
+                token_data = await response.json()
+                self.access_token = token_data["access_token"]
+                expires_in = token_data.get("expires_in", 3600)
+                self.token_expires_at = time.time() + expires_in
+            else:
+                error = await response.text()
+                raise Exception(f"Failed to refresh token: {error}")
     
     async def _api_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """Make API request to Spotify."""
@@ -171,15 +202,17 @@ class SpotifyClient:
         }
         headers.update(kwargs.pop("headers", {}))
         
-        async with aiohttp.ClientSession() as session:
-            async with session.request(method, url, headers=headers, **kwargs) as response:
-                if response.status in [200, 201, 204]:
-                    if response.status == 204:
-                        return {}
-                    return await response.json()
-                else:
-                    error = await response.text()
-                    raise Exception(f"Spotify API error: {error}")
+        await get_token_bucket("spotify:api", SPOTIFY_API_PER_MINUTE, SPOTIFY_API_BURST).acquire()
+        
+        session = await self._get_session()
+        async with session.request(method, url, headers=headers, **kwargs) as response:
+            if response.status in [200, 201, 204]:
+                if response.status == 204:
+                    return {}
+                return await response.json()
+            else:
+                error = await response.text()
+                raise Exception(f"Spotify API error: {error}")
     
     async def get_current_playback(self) -> Optional[Dict[str, Any]]:
         """Get current playback state."""
@@ -255,3 +288,8 @@ def get_spotify_client() -> SpotifyClient:
         _spotify_client = SpotifyClient()
     return _spotify_client
 
+
+async def close_spotify_client():
+    """Close the global Spotify client's HTTP session (call on shutdown)."""
+    if _spotify_client is not None:
+        await _spotify_client.close()
@@ -7,6 +7,7 @@ REST API endpoints for memory CRUD operations and search.
 from fastapi import APIRouter, HTTPException, Depends
 from typing import Optional
 from datetime import datetime
+import asyncio
 
 from .models import (
     MemoryItem,
@@ -75,7 +76,7 @@ async def create_memory(
     )
     
     # Store in database
-    created = storage.create(memory)
+    created = await asyncio.to_thread(storage.create, memory)
     return created
 
 
@@ -111,7 +112,8 @@ async def list_memories(
         )
     
     # List memories
-    memories = storage.list(
+    memories = await asyncio.to_thread(
+        storage.list,
         user_id=user_id,
         project_id=project_id,
         memory_type=memory_type,
@@ -144,7 +146,7 @@ async def get_memory(
     Raises:
         HTTPException: 404 if not found or not owned by user
     """
-    memory = storage.get(memory_id, user_id)
+    memory = await asyncio.to_thread(storage.get, memory_id, user_id)
     
     if not memory:
         raise HTTPException(
@@ -202,7 +204,7 @@ async def update_memory(
         )
     
     # Update memory
-    updated = storage.update(memory_id, user_id, updates)
+    updated = await asyncio.to_thread(storage.update, memory_id, user_id, updates)
     
     if not updated:
         raise HTTPException(
@@ -240,7 +242,7 @@ async def delete_memory(
         )
     
     # Delete memory
-    deleted = storage.delete(memory_id, user_id)
+    deleted = await asyncio.to_thread(storage.delete, memory_id, user_id)
     
     if not deleted:
         raise HTTPException(
@@ -272,7 +274,8 @@ async def search_memories(
         )
     
     # Search memories
-    memories = storage.search(
+    memories = await asyncio.to_thread(
+        storage.search,
         user_id=request.user_id,
         query=request.query,
         project_id=request.project_id,
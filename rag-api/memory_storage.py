@@ -6,12 +6,29 @@ Supports ChromaDB and can be extended for Firestore/BigQuery.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from collections import OrderedDict
 from datetime import datetime
+import functools
+import os
+import threading
+import time
 import chromadb
 from chromadb.config import Settings
+from chromadb.utils import embedding_functions
 
 from .models import MemoryItem
+from .monitoring.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# Recent search queries whose embeddings are kept in memory
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("MEMORY_QUERY_EMBEDDING_CACHE_SIZE", "1024"))
+
+# Recently written/read memory items kept for get() (entries, seconds)
+MEMORY_ITEM_CACHE_SIZE = int(os.getenv("MEMORY_ITEM_CACHE_SIZE", "10000"))
+MEMORY_ITEM_CACHE_TTL = float(os.getenv("MEMORY_ITEM_CACHE_TTL", "300"))
 
 
 class MemoryStorage(ABC):
@@ -37,6 +54,20 @@ class MemoryStorage(ABC):
         """
         pass
     
+    def create_many(self, memories: List[MemoryItem]) -> List[MemoryItem]:
+        """
+        Create several memory items.
+        
+        Backends that support batch inserts should override this.
+        
+        Args:
+            memories: Memory items to create
+            
+        Returns:
+            Created memory items
+        """
+        return [self.create(memory) for memory in memories]
+    
     @abstractmethod
     def get(self, memory_id: str, user_id: str) -> Optional[MemoryItem]:
         """
@@ -146,34 +177,119 @@ class ChromaDBMemoryStorage(MemoryStorage):
             path=persist_directory,
             settings=Settings(anonymized_telemetry=False)
         )
+        # Same model Chroma uses by default, held here so search can reuse
+        # query embeddings instead of re-embedding repeated queries
+        self.embedding_function = embedding_functions.DefaultEmbeddingFunction()
         self.collection = self.client.get_or_create_collection(
             name=collection_name,
-            metadata={"hnsw:space": "cosine"}
+            metadata={"hnsw:space": "cosine"},
+            embedding_function=self.embedding_function
+        )
+        self._query_embedding = functools.lru_cache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)(
+            self._embed_query
         )
+        
+        # memory_id -> (expires_at, item); write-through from create/update
+        self._item_cache: "OrderedDict[str, Tuple[float, MemoryItem]]" = OrderedDict()
+        self._item_cache_lock = threading.Lock()
+    
+    def _cache_get(self, memory_id: str) -> Optional[MemoryItem]:
+        """Return a copy of a cached item, or None if absent/expired."""
+        with self._item_cache_lock:
+            entry = self._item_cache.get(memory_id)
+            if entry is None:
+                return None
+            expires_at, item = entry
+            if time.monotonic() >= expires_at:
+                del self._item_cache[memory_id]
+                return None
+            self._item_cache.move_to_end(memory_id)
+            return item.model_copy()
+    
+    def _cache_put(self, memory: MemoryItem):
+        """Cache a copy of an item so callers can't mutate the cached one."""
+        with self._item_cache_lock:
+            self._item_cache[memory.id] = (time.monotonic() + MEMORY_ITEM_CACHE_TTL, memory.model_copy())
+            self._item_cache.move_to_end(memory.id)
+            while len(self._item_cache) > MEMORY_ITEM_CACHE_SIZE:
+                self._item_cache.popitem(last=False)
+    
+    def _cache_pop(self, memory_id: str):
+        """Drop an item from the cache."""
+        with self._item_cache_lock:
+            self._item_cache.pop(memory_id, None)
+    
+    def _embed_query(self, query: str) -> List[float]:
+        """Embed a single search query (cached via _query_embedding)."""
+        return [float(x) for x in self.embedding_function([query])[0]]
+    
+    @staticmethod
+    def _build_where(
+        user_id: str,
+        project_id: Optional[str],
+        memory_type: Optional[str]
+    ) -> dict:
+        """
+        Build a ChromaDB where filter for the given ownership/filters.
+        
+        ChromaDB accepts only one condition per where dict, so several
+        are combined with $and (evaluated inside Chroma, not in Python).
+        """
+        conditions = [{"user_id": user_id}]
+        if project_id is not None:
+            conditions.append({"project_id": project_id})
+        if memory_type is not None:
+            conditions.append({"memory_type": memory_type})
+        
+        if len(conditions) == 1:
+            return conditions[0]
+        return {"$and": conditions}
+    
+    @staticmethod
+    def _metadata(memory: MemoryItem, created_at: str, updated_at: str) -> dict:
+        """ChromaDB metadata for a memory item (timestamps pre-formatted)."""
+        return {
+            "user_id": memory.user_id,
+            "project_id": memory.project_id or "",
+            "memory_type": memory.memory_type,
+            "created_at": created_at,
+            "updated_at": updated_at
+        }
     
     def create(self, memory: MemoryItem) -> MemoryItem:
         """Create a new memory item."""
+        return self.create_many([memory])[0]
+    
+    def create_many(self, memories: List[MemoryItem]) -> List[MemoryItem]:
+        """Create several memory items with one ChromaDB add (one embedding batch)."""
+        if not memories:
+            return []
+        
         # Update timestamps
-        memory.created_at = datetime.utcnow()
-        memory.updated_at = datetime.utcnow()
+        now = datetime.utcnow()
+        now_iso = now.isoformat()
+        for memory in memories:
+            memory.created_at = now
+            memory.updated_at = now
         
         # Store in ChromaDB
         self.collection.add(
-            ids=[memory.id],
-            documents=[memory.content],
-            metadatas=[{
-                "user_id": memory.user_id,
-                "project_id": memory.project_id or "",
-                "memory_type": memory.memory_type,
-                "created_at": memory.created_at.isoformat(),
-                "updated_at": memory.updated_at.isoformat()
-            }]
+            ids=[memory.id for memory in memories],
+            documents=[memory.content for memory in memories],
+            metadatas=[self._metadata(memory, now_iso, now_iso) for memory in memories]
         )
+        for memory in memories:
+            self._cache_put(memory)
         
-        return memory
+        return memories
     
     def get(self, memory_id: str, user_id: str) -> Optional[MemoryItem]:
         """Get a memory item by ID."""
+        cached = self._cache_get(memory_id)
+        if cached is not None:
+            # Verify ownership
+            return cached if cached.user_id == user_id else None
+        
         try:
             results = self.collection.get(
                 ids=[memory_id],
@@ -189,7 +305,7 @@ class ChromaDBMemoryStorage(MemoryStorage):
             if metadata["user_id"] != user_id:
                 return None
             
-            return MemoryItem(
+            memory = MemoryItem(
                 id=memory_id,
                 user_id=metadata["user_id"],
                 project_id=metadata["project_id"] or None,
@@ -198,7 +314,10 @@ class ChromaDBMemoryStorage(MemoryStorage):
                 created_at=datetime.fromisoformat(metadata["created_at"]),
                 updated_at=datetime.fromisoformat(metadata["updated_at"])
             )
+            self._cache_put(memory)
+            return memory
         except Exception:
+            logger.exception("Error getting memory %s", memory_id)
             return None
     
     def list(
@@ -209,12 +328,7 @@ class ChromaDBMemoryStorage(MemoryStorage):
         limit: int = 100
     ) -> List[MemoryItem]:
         """List memory items for a user."""
-        # Build where clause
-        where = {"user_id": user_id}
-        if project_id is not None:
-            where["project_id"] = project_id
-        if memory_type is not None:
-            where["memory_type"] = memory_type
+        where = self._build_where(user_id, project_id, memory_type)
         
         try:
             results = self.collection.get(
@@ -238,6 +352,7 @@ class ChromaDBMemoryStorage(MemoryStorage):
             
             return memories
         except Exception:
+            logger.exception("Error listing memories for user %s", user_id)
             return []
     
     def update(self, memory_id: str, user_id: str, updates: dict) -> Optional[MemoryItem]:
@@ -248,6 +363,7 @@ class ChromaDBMemoryStorage(MemoryStorage):
             return None
         
         # Apply updates
+        content_changed = "content" in updates and updates["content"] != memory.content
         if "content" in updates:
             memory.content = updates["content"]
         if "memory_type" in updates:
@@ -257,18 +373,16 @@ class ChromaDBMemoryStorage(MemoryStorage):
         
         memory.updated_at = datetime.utcnow()
         
-        # Update in ChromaDB
+        # Update in ChromaDB; the document is only sent (and re-embedded)
+        # when the content actually changed
         self.collection.update(
             ids=[memory_id],
-            documents=[memory.content],
-            metadatas=[{
-                "user_id": memory.user_id,
-                "project_id": memory.project_id or "",
-                "memory_type": memory.memory_type,
-                "created_at": memory.created_at.isoformat(),
-                "updated_at": memory.updated_at.isoformat()
-            }]
+            documents=[memory.content] if content_changed else None,
+            metadatas=[self._metadata(
+                memory, memory.created_at.isoformat(), memory.updated_at.isoformat()
+            )]
         )
+        self._cache_put(memory)
         
         return memory
     
@@ -281,6 +395,7 @@ class ChromaDBMemoryStorage(MemoryStorage):
         
         # Delete from ChromaDB
         self.collection.delete(ids=[memory_id])
+        self._cache_pop(memory_id)
         return True
     
     def search(
@@ -292,16 +407,11 @@ class ChromaDBMemoryStorage(MemoryStorage):
         limit: int = 10
     ) -> List[MemoryItem]:
         """Search memories using semantic search."""
-        # Build where clause
-        where = {"user_id": user_id}
-        if project_id is not None:
-            where["project_id"] = project_id
-        if memory_type is not None:
-            where["memory_type"] = memory_type
+        where = self._build_where(user_id, project_id, memory_type)
         
         try:
             results = self.collection.query(
-                query_texts=[query],
+                query_embeddings=[self._query_embedding(query)],
                 where=where,
                 n_results=limit,
                 include=["documents", "metadatas", "distances"]
@@ -323,5 +433,6 @@ class ChromaDBMemoryStorage(MemoryStorage):
             
             return memories
         except Exception:
+            logger.exception("Error searching memories for user %s", user_id)
             return []
 
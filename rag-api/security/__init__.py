@@ -9,7 +9,7 @@ Provides:
 """
 
 from .auth import JWTManager, get_jwt_manager, require_auth
-from .rate_limit import RateLimiter, get_rate_limiter, rate_limit_middleware
+from .rate_limit import RateLimiter, get_rate_limiter, rate_limit_middleware, TokenBucket, get_token_bucket
 from .validation import validate_input, sanitize_input
 from .api_keys import APIKeyManager, get_api_key_manager
 
@@ -20,6 +20,8 @@ __all__ = [
     "RateLimiter",
     "get_rate_limiter",
     "rate_limit_middleware",
+    "TokenBucket",
+    "get_token_bucket",
     "validate_input",
     "sanitize_input",
     "APIKeyManager",
@@ -7,6 +7,8 @@ Provides rate limiting middleware and decorators.
 from typing import Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict
+import asyncio
+import os
 import time
 import threading
 from fastapi import Request, HTTPException, status
@@ -214,3 +216,61 @@ def rate_limit_middleware(app, rate_limiter: Optional[RateLimiter] = None):
     """Create rate limit middleware."""
     return RateLimitMiddleware(app, rate_limiter)
 
+
+class TokenBucket:
+    """
+    Token bucket for pacing outbound calls to a rate-limited provider.
+    
+    Callers wait for capacity instead of sending requests that the provider
+    would reject with 429.
+    """
+    
+    __slots__ = ("rate", "capacity", "tokens", "last")
+    
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Initialize token bucket.
+        
+        Args:
+            per_minute: Sustained requests per minute
+            capacity: Max burst size (defaults to one minute's worth)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+    
+    async def acquire(self, n: float = 1):
+        """
+        Take n tokens, sleeping until they are available.
+        
+        Tokens are reserved before sleeping (the balance may go negative),
+        so concurrent callers queue up behind each other without a lock.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        self.tokens -= n
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.rate)
+
+
+# Token buckets per (provider, endpoint)
+_token_buckets: Dict[str, TokenBucket] = {}
+
+def get_token_bucket(key: str, per_minute: float, capacity: Optional[float] = None) -> TokenBucket:
+    """
+    Get the shared token bucket for an outbound endpoint.
+    
+    Args:
+        key: Bucket name, e.g. "suno:generate"
+        per_minute: Sustained requests per minute (used on first call)
+        capacity: Max burst size (used on first call)
+    
+    Returns:
+        TokenBucket instance
+    """
+    if key not in _token_buckets:
+        _token_buckets[key] = TokenBucket(per_minute, capacity)
+    return _token_buckets[key]
+
@@ -34,6 +34,22 @@ class TestChromaDBMemoryStorage:
         assert created.content == "Test memory content"
         assert created.user_id == "test_user"
     
+    def test_create_many_memories(self, storage):
+        """Test batch memory creation."""
+        memories = [
+            MemoryItem(
+                user_id="test_user",
+                content=f"Batch memory {i}",
+                memory_type="fact"
+            )
+            for i in range(3)
+        ]
+        
+        created = storage.create_many(memories)
+        
+        assert [m.id for m in created] == [m.id for m in memories]
+        assert len(storage.list("test_user")) == 3
+    
     def test_get_memory(self, storage):
         """Test memory retrieval."""
         memory = MemoryItem(
@@ -77,6 +93,26 @@ class TestChromaDBMemoryStorage:
         
         assert len(memories) == 3
     
+    def test_list_memories_by_project(self, storage):
+        """Test memory listing filtered by project."""
+        project_memory = MemoryItem(
+            user_id="test_user",
+            project_id="project1",
+            content="Project memory",
+            memory_type="fact"
+        )
+        global_memory = MemoryItem(
+            user_id="test_user",
+            content="Global memory",
+            memory_type="fact"
+        )
+        storage.create(project_memory)
+        storage.create(global_memory)
+        
+        memories = storage.list("test_user", project_id="project1")
+        
+        assert [m.id for m in memories] == [project_memory.id]
+    
     def test_update_memory(self, storage):
         """Test memory update."""
         memory = MemoryItem(
@@ -112,6 +148,50 @@ class TestChromaDBMemoryStorage:
         retrieved = storage.get(memory.id, "test_user")
         assert retrieved is None
     
+    def test_get_after_update_returns_new_content(self, storage):
+        """Test that a cached item is replaced on update."""
+        memory = MemoryItem(
+            user_id="test_user",
+            content="Original content",
+            memory_type="fact"
+        )
+        storage.create(memory)
+        storage.get(memory.id, "test_user")  # Populate the item cache
+        
+        storage.update(memory.id, "test_user", {"content": "Updated content"})
+        retrieved = storage.get(memory.id, "test_user")
+        
+        assert retrieved.content == "Updated content"
+    
+    def test_get_after_delete_returns_none(self, storage):
+        """Test that a cached item is dropped on delete."""
+        memory = MemoryItem(
+            user_id="test_user",
+            content="To be deleted",
+            memory_type="fact"
+        )
+        storage.create(memory)
+        storage.get(memory.id, "test_user")  # Populate the item cache
+        
+        storage.delete(memory.id, "test_user")
+        
+        assert storage.get(memory.id, "test_user") is None
+    
+    def test_mutating_returned_memory_keeps_cache(self, storage):
+        """Test that callers get copies, not the cached item."""
+        memory = MemoryItem(
+            user_id="test_user",
+            content="Cached content",
+            memory_type="fact"
+        )
+        storage.create(memory)
+        
+        memory.content = "Changed after create"
+        retrieved = storage.get(memory.id, "test_user")
+        retrieved.content = "Changed after get"
+        
+        assert storage.get(memory.id, "test_user").content == "Cached content"
+    
     def test_search_memories(self, storage):
         """Test semantic memory search."""
         # Create memories
@@ -137,4 +217,27 @@ class TestChromaDBMemoryStorage:
         
         # Should return relevant memories (exact results depend on embeddings)
         assert len(results) >= 0  # May be 0 if embeddings not initialized
-
+    
+    def test_search_memories_by_type(self, storage):
+        """Test semantic memory search filtered by type."""
+        preference = MemoryItem(
+            user_id="test_user",
+            content="User prefers Slack notifications",
+            memory_type="preference"
+        )
+        fact = MemoryItem(
+            user_id="test_user",
+            content="User works on the notifications service",
+            memory_type="fact"
+        )
+        storage.create(preference)
+        storage.create(fact)
+        
+        results = storage.search(
+            user_id="test_user",
+            query="notifications",
+            memory_type="fact",
+            limit=10
+        )
+        
+        assert [m.id for m in results] == [fact.id]